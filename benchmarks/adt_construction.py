@@ -0,0 +1,49 @@
+"""
+Construction and field access benchmark for `data` classes,
+compared with `namedtuple` and slotted dataclasses.
+
+Run with `python -m benchmarks.adt_construction` from the repository root.
+"""
+import timeit
+from collections import namedtuple
+from dataclasses import dataclass
+from funklib.datatypes.adt import data
+from funklib.datatypes.failable import Success
+
+
+class Point(data):
+    _fields = ("x", "y")
+
+
+PointTuple = namedtuple("PointTuple", ("x", "y"))
+
+
+@dataclass(slots=True)
+class PointClass:
+    x: int
+    y: int
+
+
+def bench(label, stmt, namespace, number=1000000):
+    elapsed = min(timeit.repeat(stmt, globals=namespace, number=number, repeat=5))
+    print("{:<40} {:8.1f} ns".format(label, elapsed / number * 1e9))
+
+
+def main():
+    namespace = dict(
+        Point=Point, PointTuple=PointTuple, PointClass=PointClass, Success=Success,
+        p=Point(1, 2), pt=PointTuple(1, 2), pc=PointClass(1, 2)
+    )
+    bench("data(1, 2)", "Point(1, 2)", namespace)
+    bench("data(x=1, y=2)", "Point(x=1, y=2)", namespace)
+    bench("namedtuple(1, 2)", "PointTuple(1, 2)", namespace)
+    bench("dataclass(slots=True)(1, 2)", "PointClass(1, 2)", namespace)
+    bench("Success(1)", "Success(1)", namespace)
+    bench("Success(None) (interned)", "Success(None)", namespace)
+    bench("data.x", "p.x", namespace)
+    bench("namedtuple.x", "pt.x", namespace)
+    bench("dataclass(slots=True).x", "pc.x", namespace)
+
+
+if __name__ == "__main__":
+    main()
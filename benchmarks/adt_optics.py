@@ -0,0 +1,66 @@
+"""
+Benchmark of the optics generated for `data` classes,
+compared with hand-written lenses and prisms going through the constructors,
+calling the same public methods on both sides.
+The generated optics are faster for gets, modifications and successful matches;
+when the constructor does not match, the generated `try_get` is on par or slightly slower,
+as it checks the exact class before falling back to isinstance.
+
+Run with `python -m benchmarks.adt_optics` from the repository root.
+"""
+import timeit
+from funklib.datatypes.adt import data
+from funklib.datatypes.option import Some, Nothing
+from funklib.optics.lens import Lens
+from funklib.optics.prism import Prism
+from funklib.optics.adt import field_lenses, constructor_prisms
+
+
+class Point(data):
+    _fields = ("x", "y", "z")
+
+
+class Ok(data):
+    _fields = ("value",)
+
+
+class Error(data):
+    _fields = ("value",)
+
+
+def bench(label, stmt, namespace, number=500000):
+    elapsed = min(timeit.repeat(stmt, globals=namespace, number=number, repeat=5))
+    print("{:<48} {:8.1f} ns".format(label, elapsed / number * 1e9))
+
+
+def main():
+    handwritten_y = Lens.from_functions(
+        get=lambda s: s.y,
+        modify=lambda f: lambda s: Point(x=s.x, y=f(s.y), z=s.z)
+    )
+    handwritten_ok = Prism.from_functions(
+        try_get=lambda s: Some(s.value) if isinstance(s, Ok) else Nothing,
+        recover=lambda a: Ok(value=a)
+    )
+    namespace = dict(
+        point=Point(1, 2, 3), ok=Ok(1), error=Error(1), inc=lambda x: x + 1,
+        handwritten_y=handwritten_y, generated_y=field_lenses(Point).y,
+        handwritten_ok=handwritten_ok, generated_ok=constructor_prisms(Ok, Error).Ok,
+    )
+    # both sides go through the same public methods, so only the implementations differ
+    for label, stmt in [("field get", "{}_y.get(point)"),
+                        ("field modify", "{}_y.modify(inc)(point)"),
+                        ("constructor try_get, match", "{}_ok.try_get(ok)"),
+                        ("constructor try_get, no match", "{}_ok.try_get(error)"),
+                        ("constructor match, match", "{}_ok.match(ok)"),
+                        ("constructor match, no match", "{}_ok.match(error)"),
+                        ("constructor try_modify", "{}_ok.try_modify(inc)(ok)"),
+                        ("constructor update", "{}_ok.update(ok, inc)")]:
+        for side in ("handwritten", "generated"):
+            bench("{}, {}".format(label, side.replace("handwritten", "hand-written")), stmt.format(side), namespace)
+    # the generated lens also has a flat `update`, without building a modifier
+    bench("field update, generated", "generated_y.update(point, inc)", namespace)
+
+
+if __name__ == "__main__":
+    main()
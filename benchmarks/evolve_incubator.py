@@ -0,0 +1,111 @@
+"""
+Persist benchmark for incubators of large lists and tuples with thousands of deltas,
+compared with applying the deltas one at a time.
+
+Run with `python -m benchmarks.evolve_incubator` from the repository root.
+"""
+import timeit
+import pickle
+from funklib.datatypes.evolve import ListIncubator, TupleIncubator, DictIncubator, Journal
+
+
+SIZE = 1000000
+# applying tuple deltas one at a time is quadratic, so tuples are kept smaller
+TUPLE_SIZE = 10000
+DELTAS = 5000
+
+
+def bench(label, setup, run, number=5):
+    elapsed = min(timeit.repeat(run, setup=setup, number=1, repeat=number))
+    print("{:<50} {:10.2f} ms".format(label, elapsed * 1e3))
+
+
+def one_at_a_time(incubator):
+    """Persist without compiling the deltas, with the same bookkeeping as `Incubator.persist`"""
+    prototype = incubator.copy(incubator.initial)
+    for d in incubator.delta:
+        prototype = d.apply(prototype)
+    incubator.initial = prototype
+    incubator.reset()
+    return prototype
+
+
+def main():
+    state = {}
+
+    def list_appends():
+        state["i"] = i = ListIncubator(list(range(SIZE)))
+        for x in range(DELTAS):
+            i.append(x)
+
+    def list_mixed():
+        state["i"] = i = ListIncubator(list(range(SIZE)))
+        for x in range(DELTAS // 4):
+            i.append(x)
+            i.append(x)
+            i[x] = -x
+            i.pop()
+
+    def list_in_place_mixed():
+        state["i"] = i = ListIncubator(list(range(SIZE)), in_place=True)
+        for x in range(DELTAS // 4):
+            i.append(x)
+            i.append(x)
+            i[x] = -x
+            i.pop()
+
+    def tuple_appends():
+        state["i"] = i = TupleIncubator(tuple(range(TUPLE_SIZE)))
+        for x in range(DELTAS):
+            i.append(x)
+
+    def tuple_sets():
+        state["i"] = i = TupleIncubator(tuple(range(TUPLE_SIZE)))
+        for x in range(DELTAS):
+            i[x] = -x
+
+    def dict_sets():
+        state["i"] = i = DictIncubator(dict.fromkeys(range(SIZE)))
+        for x in range(DELTAS):
+            i[x] = x
+
+    for label, setup in [("list, {} appends", list_appends),
+                         ("list, {} mixed deltas", list_mixed),
+                         ("list in place, {} mixed deltas", list_in_place_mixed),
+                         ("tuple, {} appends", tuple_appends),
+                         ("tuple, {} sets", tuple_sets),
+                         ("dict, {} sets", dict_sets)]:
+        bench((label + ", persist").format(DELTAS), setup, lambda: state["i"].persist())
+        number = 1 if "tuple" in label else 5
+        bench((label + ", one at a time").format(DELTAS), setup, lambda: one_at_a_time(state["i"]), number)
+
+    journal = Journal()
+    i = ListIncubator([], journal=journal, in_place=True)
+    for x in range(1000):
+        i.extend(list(range(1000)))
+        i[x] = -x
+        i.persist()
+    data = journal.dumps()
+    print("journal of {} persists: {} bytes, pickled: {} bytes".format(
+        len(journal), len(data), len(pickle.dumps(journal.entries))
+    ))
+
+    sets = Journal()
+    i = ListIncubator(list(range(1000)), journal=sets, in_place=True)
+    for x in range(1000):
+        i[x] = -x
+    for x in range(100):
+        for y in range(10):
+            i[x * 10 + y] = x
+        i.persist()
+    print("set-heavy journal, {} sets: {} bytes, pickled: {} bytes".format(
+        sum(map(len, sets.entries)), len(sets.dumps()), len(pickle.dumps(sets.entries))
+    ))
+    bench("journal, dumps", "pass", journal.dumps)
+    bench("journal, loads", "pass", lambda: Journal.loads(data))
+    bench("journal, bulk replay", "pass", lambda: journal.replay(ListIncubator([], in_place=True), bulk=True))
+    bench("journal, replay one entry at a time", "pass", lambda: journal.replay(ListIncubator([], in_place=True)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Access and update benchmark for optics, 
+compared with reducing over the composed optics one at a time.
+
+Run with `python -m benchmarks.optics` from the repository root.
+"""
+import timeit
+import functools as ft
+from collections import ChainMap
+from funklib.optics.lens import DictItem, TupleItem
+from funklib.optics.prism import Prism, Some_, NoMatch
+from funklib.datatypes.option import Some, Nothing
+from funklib.datatypes.persistent import PersistentMap
+from funklib.optics.traversal import Each
+
+
+def bench(label, stmt, namespace, number=200000):
+    elapsed = min(timeit.repeat(stmt, globals=namespace, number=number, repeat=5))
+    print("{:<50} {:8.1f} ns".format(label, elapsed / number * 1e9))
+
+
+def reduced_get(lenses, s):
+    return ft.reduce(lambda x, g: g.get(x), lenses, s)
+
+
+def reduced_modify(lenses, f):
+    return ft.reduce(lambda x, lens: lens.modify(x), reversed(lenses), f)
+
+
+def reduced_try_get(prisms, s):
+    return ft.reduce(lambda x, p: x.then(p.try_get), prisms, Some(s))
+
+
+def main():
+    lens = DictItem("server").then(DictItem("limits")).then(TupleItem(1))
+    config = {"server": {"limits": (10, 20, 30), "name": "main"}, "debug": False}
+    namespace = dict(
+        lens=lens, lenses=tuple(lens), config=config, inc=lambda x: x + 1,
+        reduced_get=reduced_get, reduced_modify=reduced_modify
+    )
+    bench("composed lens get, reduced", "reduced_get(lenses, config)", namespace)
+    bench("composed lens get, compiled", "lens.get(config)", namespace)
+    bench("composed lens modify, reduced", "reduced_modify(lenses, inc)(config)", namespace)
+    bench("composed lens modify, compiled", "lens.modify(inc)(config)", namespace)
+    bench("composed lens update, compiled", "lens.update(config, inc)", namespace)
+
+    ports = DictItem("servers").then(Each()).then(DictItem("limits")).then(TupleItem(0))
+    servers = {"servers": [{"limits": (i, i), "name": str(i)} for i in range(100)]}
+    namespace.update(ports=ports, servers=servers, records=[config] * 100)
+    bench("update 100 list elements, lens per element", 
+          "s = servers\n"
+          "for i in range(100):\n"
+          "    s = DictItem('servers').modify(lambda l, i=i: l[:i] + [limit.modify(inc)(l[i])] + l[i+1:])(s)",
+          dict(namespace, DictItem=DictItem, limit=DictItem("limits").then(TupleItem(0))), number=2000)
+    bench("update 100 list elements, traversal", "ports.modify(inc)(servers)", namespace, number=2000)
+    bench("modify 100 records, modify per record", "[lens.modify(inc)(r) for r in records]", namespace, number=2000)
+    bench("modify 100 records, modify_many", "lens.modify_many(records, inc)", namespace, number=2000)
+
+    items = [(str(i), i) for i in range(10000)]
+    namespace.update(
+        key=DictItem("42"), item=TupleItem(5000), big_tuple=tuple(range(10000)),
+        big_dict=dict(items), big_map=PersistentMap(items), overlay=ChainMap({}, dict(items)),
+        mutable=DictItem("a").then(DictItem("b")), nested={"a": {"b": 0}}
+    )
+    bench("one key update, 10000 keys dict", "key.modify(inc)(big_dict)", namespace, number=2000)
+    bench("one key update, 10000 keys persistent map", "key.modify(inc)(big_map)", namespace, number=2000)
+    bench("one key update, 10000 keys ChainMap overlay", "key.modify(inc)(overlay)", namespace, number=2000)
+    bench("one item update, 10000 items tuple", "item.modify(inc)(big_tuple)", namespace, number=2000)
+    bench("nested update, persistent", "mutable.update(nested, inc)", namespace)
+    bench("nested update, in place", "mutable.update_in_place(nested, inc)", namespace)
+
+    prism = Some_.then(Some_).then(Prism.from_match(lambda s: s if type(s) is int else NoMatch, int))
+    namespace.update(
+        prism=prism, prisms=tuple(prism), reduced_try_get=reduced_try_get,
+        message=Some(Some(1)), other=Some(Nothing)
+    )
+    bench("composed prism try_get, reduced", "reduced_try_get(prisms, message)", namespace)
+    bench("composed prism try_get, compiled", "prism.try_get(message)", namespace)
+    bench("composed prism match, compiled", "prism.match(message)", namespace)
+    bench("composed prism no match, compiled", "prism.match(other)", namespace)
+    bench("composed prism update, compiled", "prism.update(message, inc)", namespace)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
 import operator as op
 import functools as ft
+import itertools as it
+from collections.abc import Sequence, Mapping, Set
+import re
+from keyword import iskeyword
 import funklib.core.prelude as prelude
 
 
+_missing = object()
+
+
 def resolve_straight_attribute_path(obj, path, default=None):
     try:
         return op.attrgetter(path)(obj)
@@ -11,30 +18,65 @@ def resolve_straight_attribute_path(obj, path, default=None):
 
 
 def attribute_path_resolver(path, default=None):
-    if "*" in path:
-        return ft.partial(resolve_path, path=path, default=default)
+    if "*" in path or "[" in path:
+        return ft.partial(resolve_attribute_path, path=path, default=default)
     else:
-        return ft.partial(resolve_straight_path, path=path, default=default)
+        return ft.partial(resolve_straight_attribute_path, path=path, default=default)
+
+
+_component_pattern = re.compile(r"^(?P<attr>[^\[\]]*)(?P<indexes>(\[[^\[\]]*\])*)$")
+_index_pattern = re.compile(r"\[([^\[\]]*)\]")
+
+
+def parse_index(index):
+    """Index or Slice resolver for the text between brackets of a path component"""
+    if ":" in index:
+        return Slice(*(int(x) if x.strip() else None for x in index.split(":")))
+    try:
+        return Index(int(index))
+    except ValueError:
+        return Index(index)
+
+
+@ft.lru_cache(maxsize=1024)
+def parse_attribute_path(path):
+    """
+    Compile an attribute path into a resolver chain.
+    Components are separated by dots, and are either an attribute name,
+    `*` for each element of a collection, or `**` for recursive descent into nested collections.
+    Components may be followed by indexes or slices between brackets, e.g `orders[0:10].items[-1].sku`.
+    Like `*`, a slice resolves to each of the elements in its range,
+    and both resolve to default when the value they apply to is not iterable.
+    Recursive descent only walks the elements of collections(mapping values, sequences and sets),
+    not the attributes of objects: `orders.**.sku` finds the sku of orders and of their nested elements,
+    but not of `orders.*.items`, which needs `orders.*.items.*.sku`.
+    """
+    resolvers = []
+    for component in path.split("."):
+        match = _component_pattern.match(component)
+        if match is None:
+            raise ValueError("Invalid path component {!r} in path {!r}".format(component, path))
+        attr = match.group("attr")
+        if attr == "*":
+            resolvers.append(ForEach())
+        elif attr == "**":
+            resolvers.append(Descend())
+        elif attr:
+            resolvers.append(Attr(attr))
+        resolvers.extend(map(parse_index, _index_pattern.findall(match.group("indexes"))))
+    return ResolverChain(*resolvers)
 
 
 def resolve_attribute_path(obj, path, default=None):
-    components = path.split(".")
-    if "*" in components:
-        branch_point = components.index("*")
-        stretch = components[:branch_point]
-        getter = op.attrgetter(".".join(stretch))
-        try:
-            collection = getter(obj)
-        except AttributeError:
-            return default
-        else:
-            next_stretch = components[branch_point + 1:]
-            if len(next_stretch) > 0:
-                return map(
-                    attribute_path_resolver(".".join(next_stretch), default),
-                    collection)
-            else:
-                return collection
+    """
+    Resolve an attribute path(see `parse_attribute_path`) on obj.
+    Paths without wildcards, slices or recursive descent return a single value, or default.
+    Other paths return a lazy generator of the values at the end of every branch,
+    with default for branches which cannot be followed, except below a recursive descent,
+    where they are skipped.
+    """
+    if "*" in path or "[" in path:
+        return parse_attribute_path(path).resolve(obj, default)
     else:
         return resolve_straight_attribute_path(obj, path, default)
 
@@ -50,17 +92,195 @@ def resolve_straigth_index_path(obj, path, default=None):
     else:
         return node
 
-    
+
+def expand_or(expand, obj, fallback):
+    """Iterator over the values of expand(obj), or over fallback if obj cannot be expanded, not being iterable"""
+    try:
+        return expand(obj)
+    except TypeError:
+        return iter(fallback)
+
+
+class ChainCompiler:
+    """
+    Generates the code of a resolver chain as a single function.
+    Runs of consecutive Attr and Index resolvers become one expression(`t.a.b[0].c`),
+    guarded by a single try/except for the whole run.
+    Fan-out resolvers become nested loops of one generator, yielding the values of all branches,
+    with default for values which are not iterable.
+    Other resolvers are called, and checked against a sentinel for missing values.
+    """
+    def __init__(self, resolvers):
+        self.resolvers = resolvers
+        self.namespace = {"_missing": _missing}
+        self.variables = 0
+
+    def bind(self, value):
+        name = "_{}".format(len(self.namespace))
+        self.namespace[name] = value
+        return name
+
+    def variable(self):
+        self.variables += 1
+        return "t{}".format(self.variables)
+
+    def run_expression(self, t, run):
+        """Expression following a run of Attr and Index resolvers from variable t, and the exceptions it may raise"""
+        errors = set()
+        for r in run:
+            if type(r) is Attr:
+                if all(part.isidentifier() and not iskeyword(part) for part in r.attr.split(".")):
+                    t = "{}.{}".format(t, r.attr)
+                else:
+                    t = "{}({})".format(self.bind(r._attrgetter), t)
+                errors.add("AttributeError")
+            else:
+                t = "{}[{}]".format(t, self.bind(r.index))
+                errors.update(("LookupError", "TypeError"))
+        return t, "({},)".format(", ".join(sorted(errors)))
+
+    def compile_straight(self, t, start, end, pad, missing):
+        """
+        Lines of code following the resolvers from position start to end, none of which fans out,
+        from the value of variable t, and the variable holding the result.
+        `missing` is the statement ending the branch when a value is missing.
+        """
+        lines = []
+        k = start
+        while k < end:
+            r = self.resolvers[k]
+            if type(r) is Attr or type(r) is Index:
+                run = []
+                while k < end and (type(self.resolvers[k]) is Attr or type(self.resolvers[k]) is Index):
+                    run.append(self.resolvers[k])
+                    k += 1
+                expression, errors = self.run_expression(t, run)
+                t = self.variable()
+                lines += [
+                    "{}try:".format(pad),
+                    "{}    {} = {}".format(pad, t, expression),
+                    "{}except {}:".format(pad, errors),
+                ] + ["{}    {}".format(pad, statement) for statement in missing]
+            else:
+                x = self.variable()
+                lines += [
+                    "{}{} = {}({}, _missing)".format(pad, x, self.bind(r.resolve), t),
+                    "{}if {} is _missing:".format(pad, x),
+                ] + ["{}    {}".format(pad, statement) for statement in missing]
+                t = x
+                k += 1
+        return lines, t
+
+    def compile_branches(self, t, k, pad, skip_missing):
+        """Lines of code of the generator yielding the values of the branches from the fan-out resolver at position k"""
+        r = self.resolvers[k]
+        expand = "{}({})".format("iter" if type(r) is ForEach else self.bind(r.expand), t)
+        if type(r) is Descend:
+            lines = []
+        else:
+            # non-iterables resolve to default, or are skipped below a recursive descent
+            elements = self.variable()
+            lines = [
+                "{}try:".format(pad),
+                "{}    {} = {}".format(pad, elements, expand),
+                "{}except TypeError:".format(pad),
+                "{}    {} = {}".format(pad, elements, "()" if skip_missing else "(default,)"),
+            ]
+            expand = elements
+        skip_missing = skip_missing or r.skips_missing
+        x = self.variable()
+        lines.append("{}for {} in {}:".format(pad, x, expand))
+        pad += "    "
+        end = next((j for j in range(k + 1, len(self.resolvers)) if self.resolvers[j].fans_out), len(self.resolvers))
+        straight, x = self.compile_straight(
+            x, k + 1, end, pad, ("continue",) if skip_missing else ("yield default", "continue")
+        )
+        lines += straight
+        if end < len(self.resolvers):
+            lines += self.compile_branches(x, end, pad, skip_missing)
+        else:
+            lines.append("{}yield {}".format(pad, x))
+        return lines
+
+    def compile(self):
+        """Generate the resolving function of the chain, taking an object and a default value"""
+        n = len(self.resolvers)
+        fan_out = next((k for k, r in enumerate(self.resolvers) if r.fans_out), n)
+        # steps up to the first fan-out are resolved directly, the others in a generator
+        lines, t = self.compile_straight("t0", 0, fan_out, "    ", ("return default",))
+        source = ["def resolve(t0, default=None):"] + lines
+        if fan_out == n:
+            source.append("    return {}".format(t))
+        else:
+            source += ["    return branches({}, default)".format(t), "", "def branches({}, default):".format(t)]
+            source += self.compile_branches(t, fan_out, "    ", False)
+        exec("\n".join(source) + "\n", self.namespace)
+        return self.namespace["resolve"]
+
+
+def compile_chain(resolvers):
+    """Compile a sequence of resolvers into a single function resolving them on an object, with a default"""
+    return ChainCompiler(resolvers).compile()
+
+
+def descendants(obj):
+    """Pre-order iterator over obj and the elements of its nested collections(mapping values, sequences and sets)"""
+    stack = [iter((obj,))]
+    while stack:
+        for x in stack[-1]:
+            yield x
+            t = type(x)
+            if t is dict or (t is not str and isinstance(x, Mapping)):
+                stack.append(iter(x.values()))
+            elif t is list or t is tuple or (
+                    t is not str and t is not bytes and isinstance(x, (Sequence, Set))):
+                stack.append(iter(x))
+            else:
+                continue
+            break
+        else:
+            stack.pop()
+
+
 class Resolver:
+    # fan-out resolvers resolve to many values, produced by `expand`
+    fans_out = False
+    # below resolvers skipping missing values, branches which cannot be followed are dropped
+    skips_missing = False
+
     def resolve(self, obj, default=None):
         pass
 
+    def expand(self, obj):
+        """Iterator over the values a fan-out resolver resolves to on obj"""
+        return iter((self.resolve(obj),))
+
     def __rshift__(self, next_resolver):
-        return ResolverFunction(
-            lambda o, d=None: next_resolver.resolve(
-                self.resolve(o, d), d
-            )
-        )
+        return ResolverChain(self, next_resolver)
+
+
+class ResolverChain(tuple, Resolver):
+    """
+    Sequence of resolvers applied one after the other.
+    Resolves to a single value, or to a lazy generator of values if any of the resolvers fans out.
+    On first use, the chain is compiled into a single generated function, cached on the instance.
+    """
+    def __new__(cls, *resolvers):
+        return tuple.__new__(cls, (
+            r for resolver in resolvers
+            for r in (resolver if isinstance(resolver, ResolverChain) else (resolver,))
+        ))
+
+    def compile(self):
+        """Compile the chain(see `compile_chain`), replacing `resolve` on this instance by the generated function"""
+        self.resolve = compile_chain(self)
+        return self
+
+    def resolve(self, obj, default=None):
+        return self.compile().resolve(obj, default)
+
+    def __repr__(self):
+        return " >> ".join(map(repr, self)) or "ResolverChain()"
 
 
 class ResolverFunction(Resolver):
@@ -68,7 +288,6 @@ class ResolverFunction(Resolver):
         self.function = function
 
     def resolve(self, obj, default=None):
-        print(self.__class__.__name__)
         return self.function(obj, default)
 
 
@@ -78,7 +297,6 @@ class Attr(Resolver):
         self._attrgetter = op.attrgetter(attr)
 
     def resolve(self, obj, default=None):
-        print(self.__class__.__name__)
         try:
             return self._attrgetter(obj)
         except AttributeError:
@@ -87,18 +305,22 @@ class Attr(Resolver):
     def resolve_strict(self, obj, default=None):
         return self._attrgetter(obj)
 
+    def __repr__(self):
+        return "Attr({!r})".format(self.attr)
+
 
 class ForEach(Resolver):
+    """Each element of a collection, or default if obj is not iterable"""
+    fans_out = True
+
     def resolve(self, obj, default=None):
-        print(self.__class__.__name__)
+        return expand_or(iter, obj, (default,))
+
+    def expand(self, obj):
         return iter(obj)
 
-    def __rshift__(self, next_resolver):
-        return ResolverFunction(
-            lambda o, d=None: (
-                next_resolver.resolve(x, d)
-                for x in self.resolve(o, d)
-            ))
+    def __repr__(self):
+        return "ForEach()"
 
 
 class Index(Resolver):
@@ -106,8 +328,50 @@ class Index(Resolver):
         self.index = index
 
     def resolve(self, obj, default=None):
-        print(self.__class__.__name__)
         try:
             return obj[self.index]
-        except (IndexError, KeyError):
+        except (IndexError, KeyError, TypeError):
             return default
+
+    def __repr__(self):
+        return "Index({!r})".format(self.index)
+
+
+class Slice(Resolver):
+    """
+    Each element of a slice of a sequence, produced lazily:
+    sequences are indexed in the range of the slice, and other iterables are sliced with `itertools.islice`.
+    Resolves to default if obj is not iterable.
+    """
+    fans_out = True
+
+    def __init__(self, start=None, stop=None, step=None):
+        self.slice = slice(start, stop, step)
+
+    def resolve(self, obj, default=None):
+        return expand_or(self.expand, obj, (default,))
+
+    def expand(self, obj):
+        if type(obj) is list or type(obj) is tuple or isinstance(obj, Sequence):
+            return map(obj.__getitem__, range(*self.slice.indices(len(obj))))
+        return it.islice(obj, self.slice.start, self.slice.stop, self.slice.step)
+
+    def __repr__(self):
+        return "Slice({!r}, {!r}, {!r})".format(self.slice.start, self.slice.stop, self.slice.step)
+
+
+class Descend(Resolver):
+    """
+    Recursive descent: obj and every element of its nested collections, in pre-order.
+    Attributes of objects are not descended into.
+    """
+    fans_out = True
+    skips_missing = True
+
+    def resolve(self, obj, default=None):
+        return descendants(obj)
+
+    expand = resolve
+
+    def __repr__(self):
+        return "Descend()"
@@ -224,6 +224,158 @@ def last(pred=None):
     return make_transducer(step=step, complete=complete, name="last(pred={})".format(pred))
 
 
+def collecting_failables():
+    """Transducer that passes Success values through,
+    and stops at the first Failure, which becomes the result of the reduction.
+    Otherwise, the result is wrapped in a Success.
+    Streaming version of `Failable.collect`.
+    The result is replaced on completion, so this is for use with `transduce`, not `lazy_transduce`."""
+    from funklib.datatypes.failable import Success
+
+    def init(rf, state):
+        state.swap(None)
+        return rf
+
+    def step(rf, state):
+        def new_step(acc, x):
+            if x.is_failure():
+                state.swap(x)
+                raise Reduced(acc)
+            return rf(acc, x.value)
+        return new_step
+
+    def complete(rf, state):
+        def new_complete(result):
+            result = rf(result)
+            failure = state.swap(None)
+            return Success(result) if failure is None else failure
+        return new_complete
+    return make_transducer(init=init, step=step, complete=complete, name="collecting_failables")
+
+
+def collecting_all_failables():
+    """Transducer that passes Success values through until a Failure is found,
+    after which only Failure values are gathered, and become the result of the reduction
+    as a Failure of a tuple. Otherwise, the result is wrapped in a Success.
+    Streaming version of `Failable.collect_all`.
+    The result is replaced on completion, so this is for use with `transduce`, not `lazy_transduce`."""
+    from funklib.datatypes.failable import Success, Failure
+
+    def init(rf, state):
+        state.swap([])
+        return rf
+
+    def step(rf, state):
+        def new_step(acc, x):
+            if x.is_failure():
+                state.value.append(x.value)
+                return acc
+            elif state.value:
+                return acc
+            else:
+                return rf(acc, x.value)
+        return new_step
+
+    def complete(rf, state):
+        def new_complete(result):
+            result = rf(result)
+            errors = state.swap([])
+            return Failure(tuple(errors)) if errors else Success(result)
+        return new_complete
+    return make_transducer(init=init, step=step, complete=complete, name="collecting_all_failables")
+
+
+def partitioning_failables():
+    """Transducer that passes Success values through,
+    and gathers Failure values on the side. The result of the reduction
+    is a pair (result, failures).
+    Streaming version of `Failable.partition`.
+    The result is replaced on completion, so this is for use with `transduce`, not `lazy_transduce`."""
+    def init(rf, state):
+        state.swap([])
+        return rf
+
+    def step(rf, state):
+        def new_step(acc, x):
+            if x.is_failure():
+                state.value.append(x.value)
+                return acc
+            return rf(acc, x.value)
+        return new_step
+
+    def complete(rf, state):
+        def new_complete(result):
+            return rf(result), tuple(state.swap([]))
+        return new_complete
+    return make_transducer(init=init, step=step, complete=complete, name="partitioning_failables")
+
+
+def mapping_failable(f, exceptions=Exception):
+    """Transducer applying f to the value of each Success, 
+    wrapping the result in a Success, or the exception raised in a Failure,
+    like `Failable.failable_catch`. Failures pass through unchanged."""
+    from funklib.datatypes.failable import Success, Failure
+
+    def step(rf, state):
+        def new_step(acc, x):
+            if x.is_failure():
+                return rf(acc, x)
+            try:
+                y = f(x.value)
+            except exceptions as ex:
+                return rf(acc, Failure(ex))
+            return rf(acc, Success(y))
+        return new_step
+    return make_transducer(step=step, name="mapping_failable({})".format(f))
+
+
+def binding_failable(f):
+    """Transducer chaining a failable function on each element,
+    like `Success.then`. Failures pass through unchanged."""
+    def step(rf, state):
+        return lambda acc, x: rf(acc, x.then(f))
+    return make_transducer(step=step, name="binding_failable({})".format(f))
+
+
+def stopping_on_failure():
+    """Transducer passing elements through until the first Failure,
+    which is the last element passed"""
+    def step(rf, state):
+        def new_step(acc, x):
+            if x.is_failure():
+                raise Reduced(rf(acc, x))
+            return rf(acc, x)
+        return new_step
+    return make_transducer(step=step, name="stopping_on_failure")
+
+
+def routing_failures(sink, unwrap=False):
+    """Transducer sending Failures to a side sink(e.g. a `funklib.core.sinks.Sink`),
+    and passing Successes through, or their value if `unwrap` is true"""
+    def step(rf, state):
+        def new_step(acc, x):
+            if x.is_failure():
+                sink.send(x)
+                return acc
+            return rf(acc, x.value if unwrap else x)
+        return new_step
+    return make_transducer(step=step, name="routing_failures({})".format(sink))
+
+
+def counting_failures(counter, key=type):
+    """Transducer counting Failures in `counter`(e.g. a `collections.Counter`)
+    by `key` of their error value, by default the exception type.
+    All elements pass through."""
+    def step(rf, state):
+        def new_step(acc, x):
+            if x.is_failure():
+                k = key(x.value)
+                counter[k] = counter.get(k, 0) + 1
+            return rf(acc, x)
+        return new_step
+    return make_transducer(step=step, name="counting_failures(key={})".format(key))
+
+
 def transduce(transducer, reducer, reducible, init=prelude._missing):
     transduced = transducer(reducer)
     return reduce(transduced, reducible, init=init)
@@ -235,6 +387,11 @@ def consume_queue(queue):
         
 
 def lazy_transduce(transducer, source):
+    """
+    Lazily transduce the elements of source, yielding the elements produced by the transducer.
+    The transducer must complete into the accumulator it was given, 
+    so transducers replacing the result of the reduction(e.g. `collecting_failables`) can't be used.
+    """
     r = transducer(Reducer(step=conj_list))
     accumulator = collections.deque()
     for x in source:
@@ -245,10 +402,12 @@ def lazy_transduce(transducer, source):
             break
         finally:
             yield from consume_queue(accumulator)
-    else:
-        final = r(accumulator)
-        assert final is accumulator
-        yield from consume_queue(final)
+    final = r(accumulator)
+    if final is not accumulator:
+        raise TypeError("{} replaces the result on completion, and can't be used lazily".format(
+            getattr(transducer, "__name__", transducer)
+        ))
+    yield from consume_queue(final)
         
 
        
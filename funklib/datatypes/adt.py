@@ -1,5 +1,6 @@
 from abc import ABCMeta
 from operator import itemgetter
+from keyword import iskeyword
 from cachetools import LRUCache
 from funklib.multimethods.patmat import MatchFailure
 
@@ -8,15 +9,98 @@ def tuple_itemgetter(i):
         return tuple.__getitem__(x, i)
     return tuple_itemgetter2
 
+
+def field_getter(cls, i):
+    """Getter property for the i-th field of an ADT class.
+    Uses a C-level `itemgetter` unless the class overrides `__getitem__`,
+    in which case the tuple slot is accessed directly."""
+    if cls.__getitem__ is tuple.__getitem__:
+        return property(itemgetter(i))
+    else:
+        return property(tuple_itemgetter(i))
+
+
+_singleton_template = """\
+def __new__(_cls):
+    if _cls is _owner:
+        return _instance
+    return _tuple_new(_cls, ())
+"""
+
+_interned_template = """\
+        if {condition}:
+            return _i{i}
+"""
+
+_uncached_template = """\
+    return _tuple_new(_cls, ({args}))
+"""
+
+_cached_template = """\
+    _values = ({args})
+    if not _cls._cached:
+        return _tuple_new(_cls, _values)
+    _cached = _cls._cache.get(_values, None)
+    if _cached is None:
+        _cached = _cls._cache[_values] = _tuple_new(_cls, _values)
+    return _cached
+"""
+
+
+def make_constructor(cls, fields, cached=False, interned=()):
+    """
+    Generate a specialised `__new__` for an ADT class with the given fields,
+    taking the fields as regular (positional or keyword) parameters.
+    Classes without fields get a constructor returning a single preallocated instance.
+    Interned instances are returned when constructing with identical(`is`) field values.
+    Returns None if the fields cannot be used as parameter names.
+    """
+    if not all(f.isidentifier() and not iskeyword(f) and not f.startswith("_")
+               for f in fields) or len(set(fields)) != len(fields):
+        return None
+    namespace = {"_tuple_new": tuple.__new__, "_owner": cls}
+    if len(fields) == 0:
+        source = _singleton_template
+        namespace["_instance"] = tuple.__new__(cls, ())
+    else:
+        args = "".join(f + ", " for f in fields)
+        source = "def __new__(_cls{}):\n".format("".join(", " + f for f in fields))
+        if interned:
+            source += "    if _cls is _owner:\n"
+            for i, instance in enumerate(interned):
+                namespace["_i{}".format(i)] = instance
+                namespace.update(("_i{}_{}".format(i, j), x) for j, x in enumerate(tuple.__iter__(instance)))
+                source += _interned_template.format(i=i, condition=" and ".join(
+                    "{} is _i{}_{}".format(f, i, j) for j, f in enumerate(fields)
+                ))
+        source += (_cached_template if cached else _uncached_template).format(args=args)
+    exec(source, namespace)
+    __new__ = namespace["__new__"]
+    __new__.__qualname__ = cls.__qualname__ + ".__new__"
+    __new__.__module__ = cls.__module__
+    __new__._generated = True
+    return __new__
+
+
+def inherits_generic_constructor(cls):
+    """True if the closest `__new__` in the MRO of cls
+    is `data.__new__` or a generated constructor"""
+    for klass in cls.__mro__[1:]:
+        if "__new__" in vars(klass):
+            new = vars(klass)["__new__"]
+            new = getattr(new, "__func__", new)
+            return klass is data or getattr(new, "_generated", False)
+    return False
+
 class ADTMeta(ABCMeta):
     """Metaclass for ADT-like types"""
-    def __new__(cls, name, bases, attrs, cached=False, maxsize=100, **kwargs):
+    def __new__(cls, name, bases, attrs, cached=False, maxsize=100, interned=False, **kwargs):
         if not (tuple in bases or any(issubclass(c, tuple) for c in bases)):
             bases = bases + (tuple,)
         attrs["__slots__"] = ()
         return super(ADTMeta, cls).__new__(cls, name, bases, attrs, **kwargs)
 
-    def __init__(cls, name, bases, attrs, functoid=True, cached=False, maxsize=100, **kwargs):
+    def __init__(cls, name, bases, attrs, functoid=True, cached=False, maxsize=100, interned=False, **kwargs):
         super().__init__(name, bases, attrs, **kwargs)
         annots = tuple(getattr(cls, "__annotations__", {}))        
         
@@ -24,9 +108,17 @@ class ADTMeta(ABCMeta):
             else tuple(annots) or tuple(getattr(cls, "_fields", ()))
 
         for i, field in enumerate(fields):
-            setattr(cls, field, property(tuple_itemgetter(i)))
-        cls._cache = LRUCache(maxsize=(1 if len(fields) == 0 else maxsize)) if cached else None
-        cls._cached = cached
+            setattr(cls, field, field_getter(cls, i))
+        # classes without fields are singletons, and need no cache
+        cls._cached = cached = cached and len(fields) > 0
+        cls._cache = LRUCache(maxsize=maxsize) if cached else None
+        cls._interned = None
+
+        if "__new__" not in attrs and inherits_generic_constructor(cls):
+            constructor = make_constructor(cls, fields, cached)
+            if constructor is not None:
+                cls.__new__ = staticmethod(constructor)
+                cls._interned = [] if interned and len(fields) > 0 else None
 
         # if functoid:
         #     # print(name, cls)
@@ -66,6 +158,26 @@ class data(tuple, metaclass=ADTMeta):
             else:
                 return super(data, cls).__new__(cls, values)
 
+    def __getnewargs__(self):
+        return tuple(tuple.__iter__(self))
+
+    @classmethod
+    def intern(cls, *args, **kwargs):
+        """
+        Construct an instance and register it as a constant,
+        returned by subsequent constructions with identical(`is`) field values.
+        The class must have been declared with `interned=True`.
+        Each constant adds an identity check to the constructor, 
+        so this is meant for a handful of very frequent values.
+        """
+        if cls._interned is None:
+            raise TypeError("Class {} does not support interning".format(cls.__name__))
+        instance = cls(*args, **kwargs)
+        if all(x is not instance for x in cls._interned):
+            cls._interned.append(instance)
+            cls.__new__ = staticmethod(make_constructor(cls, cls._fields, cls._cached, cls._interned))
+        return instance
+
     def __repr__(self):
         return "{}({})".format(type(self).__name__, ",".join(map(str, self)))
 
@@ -1,37 +1,102 @@
-from tupleclass import tupleclass
-from contextlib import ExitStack
-from itertools import islice, chain
-from basics import unit
+from .tupleclass import tupleclass
+from itertools import islice, chain, groupby
+from operator import itemgetter
+from array import array
+import struct
+import pickle
+import sys
 
 def window(iterable, size=2):
     slices = (islice(iterable, i, None) for i in range(size))
     return zip(*slices)
 
 
+# the single field of one-field deltas
+_first = itemgetter(0)
+
+
+def compile_deltas(deltas):
+    """
+    Merges runs of consecutive compatible deltas(e.g. appends, sets, pops)
+    into single deltas applied in one pass.
+    Deltas are compatible if they have the same `batch` function,
+    which builds the merged delta from a run.
+    Runs shorter than the `min_batch` of their first delta are kept as they are,
+    merging them costing more than applying them one at a time.
+    """
+    compiled = []
+    run = []
+    batch = None
+    # deltas are grouped by class first, so that long runs are scanned at C level
+    for cls, group in groupby(deltas, type):
+        b = cls.batch
+        if b is not batch:
+            if run:
+                _merge_run(run, batch, compiled)
+                run = []
+            batch = b
+        if b is None:
+            compiled.extend(group)
+        else:
+            run.extend(group)
+    if run:
+        _merge_run(run, batch, compiled)
+    return compiled
+
+
+def _merge_run(run, batch, compiled):
+    if len(run) >= type(run[0]).min_batch:
+        compiled.append(batch(run))
+    else:
+        compiled.extend(run)
+
+
 class Incubator:
-    def __init__(self, init):
-        self.initial = self.copy(init)
+    # whether the incubator can apply deltas to the initial value in place, see `persist`
+    supports_in_place = False
+
+    def __init__(self, init, journal=None, in_place=False):
+        if in_place and not self.supports_in_place:
+            raise TypeError("{} does not support in-place mode".format(type(self).__name__))
+        self.initial = init if in_place else self.copy(init)
+        self.undo = UndoLog() if in_place else None
         self.delta = []
+        self.journal = journal
         
     def persist(self):
         """
-        Applies all deltas to the initial value, 
-        and return the result.
-        If any delta application fails, all delta are reverted,
-        which should return the prototype to its initial value.
+        Applies all deltas, compiled into batches, to a copy of the initial value,
+        and return the result, which becomes the new initial value.
+        The initial value is left untouched until all deltas are applied,
+        so it is the snapshot to which a failed persist rolls back.
+        The result is shared with the incubator until the next persist, which copies it before applying deltas.
+
+        In in-place mode, deltas are applied to the initial value itself,
+        recording how to undo each change in an undo log, 
+        which is replayed in reverse if a delta application fails.
+        The cost of a persist is then proportional to the number of changes instead of the size of the value.
         """
-        prototype = self.initial
-        with ExitStack() as stack:
-            for d in self.delta:            
-                rollback = d.rollback(prototype)
+        deltas = compile_deltas(self.delta)
+        if len(deltas) == 0:
+            return self.initial
+        if self.undo is None:
+            prototype = self.copy(self.initial)
+            for d in deltas:
                 prototype = d.apply(prototype)
-                stack.callback(rollback.apply, prototype)
-            else:
-                stack.pop_all() # on success of all applications, rollbacks are discarded
-                # reset
-                self.initial = self.copy(prototype)
-                self.reset()
-                return prototype
+            self.initial = prototype
+        else:
+            prototype = self.initial
+            try:
+                for d in deltas:
+                    d.apply_logged(prototype, self.undo)
+            except BaseException:
+                self.undo.rollback(prototype)
+                raise
+            self.undo.clear()
+        self.reset()
+        if self.journal is not None:
+            self.journal.record(deltas)
+        return prototype
    
     def add_delta(self, delta):
         self.delta.append(delta)
@@ -42,6 +107,11 @@ class Incubator:
         else:
             for i in range(n):
                 self.delta.pop()
+
+    def savepoint(self):
+        """Savepoint at the current delta, 
+        to roll back the deltas added after it while keeping the previous ones"""
+        return Savepoint(self)
                             
     def __enter__(self):
         return self
@@ -57,16 +127,182 @@ class Incubator:
         return "{}(initial={}, delta=[{}])".format(type(self).__name__, self.initial, ",".join(map(str, self.delta)))
 
 
+class Savepoint:
+    """
+    Savepoint in the deltas of an incubator.
+    Savepoints can be nested: rolling back to one discards the deltas added after it,
+    including those of savepoints taken later.
+    Used as a context manager, rolls back if the block raises an exception.
+    A savepoint is invalidated when the incubator is persisted or reset.
+    """
+    def __init__(self, incubator):
+        self.incubator = incubator
+        self.position = len(incubator.delta)
+
+    def rollback(self):
+        """Discard the deltas added since the savepoint"""
+        self.incubator.reset(max(len(self.incubator.delta) - self.position, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, ext, ex, tb):
+        if ext is not None:
+            self.rollback()
+
+    def __repr__(self):
+        return "<Savepoint at delta {}>".format(self.position)
+
+
+class Journal:
+    """
+    Log of the deltas persisted by incubators, as one entry per persist.
+    Replaying it onto an incubator for a replica of the initial value
+    brings the replica to the same state.
+    Journals serialize to a compact binary format(see `encode_entry`), 
+    and can write their entries to a binary stream as they are recorded.
+    """
+    def __init__(self, entries=(), stream=None):
+        self.entries = list(entries)
+        self.stream = stream
+        if stream is not None and stream.tell() == 0:
+            stream.write(JOURNAL_MAGIC)
+
+    def record(self, deltas):
+        self.entries.append(tuple(deltas))
+        if self.stream is not None:
+            self.stream.write(encode_entry(deltas))
+
+    def replay(self, incubator, start=0, bulk=False):
+        """Persist the entries from index start onto incubator, returning the result.
+        In bulk, all entries are persisted at once, merging compatible deltas across entries."""
+        entries = islice(self.entries, start, None)
+        if bulk:
+            incubator.delta.extend(chain.from_iterable(entries))
+            return incubator.persist()
+        for entry in entries:
+            incubator.delta.extend(entry)
+            incubator.persist()
+        return incubator.initial
+
+    def dumps(self):
+        """The journal in binary format"""
+        return JOURNAL_MAGIC + b"".join(map(encode_entry, self.entries))
+
+    def dump(self, file):
+        file.write(self.dumps())
+
+    @classmethod
+    def loads(cls, data):
+        return cls(decode_entries(data))
+
+    @classmethod
+    def load(cls, file):
+        return cls.loads(file.read())
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __repr__(self):
+        return "Journal({} entries)".format(len(self.entries))
+
+
+class UndoLog:
+    """
+    Log of the changes made in place to a list, to undo them.
+    Records are (operation, index, old value) triples kept in parallel arrays:
+    operation codes and indices in compact typed arrays, 
+    and old values(when needed) in a list.
+    """
+    SET, INSERT, DELETE, TAIL, SNAPSHOT = range(5)
+    __slots__ = ["ops", "indices", "olds"]
+
+    def __init__(self):
+        self.ops = array("B")
+        self.indices = array("q")
+        self.olds = []
+
+    def record(self, op, index, old=None):
+        self.ops.append(op)
+        self.indices.append(index)
+        self.olds.append(old)
+
+    def set(self, index, old):
+        """Record that element at index, previously old, was replaced"""
+        self.record(UndoLog.SET, index, old)
+
+    def insert(self, index):
+        """Record that an element was inserted at index"""
+        self.record(UndoLog.INSERT, index)
+
+    def delete(self, index, old):
+        """Record that element old was removed from index"""
+        self.record(UndoLog.DELETE, index, old)
+
+    def tail(self, index, old=None):
+        """Record that the elements from index were replaced, 
+        old being the previous ones if any"""
+        self.record(UndoLog.TAIL, index, old)
+
+    def snapshot(self, target):
+        """Record a copy of the whole target, for changes that can't be recorded otherwise"""
+        self.record(UndoLog.SNAPSHOT, 0, target.copy())
+
+    def rollback(self, target):
+        """Undo the recorded changes to target, in reverse order, and clear the log"""
+        for op, index, old in zip(reversed(self.ops), reversed(self.indices), reversed(self.olds)):
+            if op == UndoLog.SET:
+                target[index] = old
+            elif op == UndoLog.INSERT:
+                del target[index]
+            elif op == UndoLog.DELETE:
+                target.insert(index, old)
+            elif op == UndoLog.TAIL:
+                target[index:] = () if old is None else old
+            else:
+                target[:] = old
+        self.clear()
+
+    def clear(self):
+        del self.ops[:]
+        del self.indices[:]
+        self.olds.clear()
+
+    def __len__(self):
+        return len(self.ops)
+
+    def __repr__(self):
+        return "<UndoLog: {} records>".format(len(self))
+
+
 class Delta(tuple):
+    # function merging a run of consecutive deltas with the same batch function into one delta,
+    # see `compile_deltas`
+    batch = None
+    # shortest run worth merging with `batch`
+    min_batch = 2
+
     def apply(self, initial):
         return NotImplemented
 
+    def apply_logged(self, initial, log):
+        """Apply the delta in place, recording how to undo it in `UndoLog` log"""
+        log.snapshot(initial)
+        return self.apply(initial)
+
     def rollback(self, initial):
         return NotImplemented
 
     def __repr__(self):
         return "<{}>".format(type(self).__name__)
 
+    def __getnewargs__(self):
+        # tupleclass constructors take the fields positionally, not the tuple of fields
+        return tuple(self)
+
 
 def make_delta(attributes, apply, rollback):
     _apply = apply
@@ -92,11 +328,38 @@ class NoOp(Delta):
 class Append(Delta):
     pass
 
+def extension_batch(extend):
+    """Batch function merging appends and extends into a single `extend` delta.
+    Merged deltas are built with tuple.__new__, skipping the argument checks of tupleclass constructors"""
+    def batch(run):
+        extension = []
+        for cls, group in groupby(run, type):
+            if issubclass(cls, Extend):
+                for d in group:
+                    extension.extend(d.extension)
+            else:
+                extension.extend(map(_first, group))
+        return tuple.__new__(extend, (extension,))
+    return batch
+
+
+def truncation_batch(truncate):
+    """Batch function merging pops of the last element into a single `truncate` delta"""
+    def batch(run):
+        return tuple.__new__(truncate, (len(run),))
+    return batch
+
+
 class ListAppend(Append):
     def apply(self, initial):
         initial.append(self.new)
         return initial
 
+    def apply_logged(self, initial, log):
+        log.tail(len(initial))
+        initial.append(self.new)
+        return initial
+
     def rollback(self, initial):
         return ListPop()
 
@@ -104,11 +367,40 @@ class ListAppend(Append):
 class Pop(Delta):
     pass
 
+@tupleclass(["count"])
+class Truncate(Delta):
+    pass
+
+class ListTruncate(Truncate):
+    def apply(self, initial):
+        if self.count > len(initial):
+            raise IndexError("pop from empty list")
+        del initial[len(initial) - self.count:]
+        return initial
+
+    def apply_logged(self, initial, log):
+        if self.count > len(initial):
+            raise IndexError("pop from empty list")
+        start = len(initial) - self.count
+        log.tail(start, initial[start:])
+        del initial[start:]
+        return initial
+
+    def rollback(self, initial):
+        return ListExtend(initial[len(initial) - self.count:])
+
 class ListPop(Pop):
+    batch = truncation_batch(ListTruncate)
+
     def apply(self, initial):
         initial.pop()
         return initial
 
+    def apply_logged(self, initial, log):
+        old = initial.pop()
+        log.delete(len(initial), old)
+        return initial
+
     def rollback(self, initial):
         return ListAppend(initial[-1]) if len(initial) > 0 else NoOp()
 
@@ -121,29 +413,57 @@ class ListPopIndex(PopIndex):
         initial.pop(self.index)
         return initial
 
+    def apply_logged(self, initial, log):
+        index = self.index if self.index >= 0 else self.index + len(initial)
+        old = initial.pop(self.index)
+        log.delete(index, old)
+        return initial
+
     def rollback(self, initial):
-        return ListInsert(self.index, initial[self.index])
+        return ListInsert(initial[self.index], self.index)
 
 
 @tupleclass(["index", "new"])    
 class Set(Delta):
     pass
         
+@tupleclass(["updates"])
+class Update(Delta):
+    pass
+
+class ListUpdate(Update):
+    def apply(self, initial):
+        for index, new in self.updates:
+            initial[index] = new
+        return initial
+
+    def apply_logged(self, initial, log):
+        for index, new in self.updates:
+            log.set(index, initial[index])
+            initial[index] = new
+        return initial
+
+    def rollback(self, initial):
+        return ListUpdate([(index, initial[index]) for index, _ in reversed(self.updates)])
+
+
 class ListSet(Set):
     def apply(self, initial):        
         initial[self.index] = self.new
         return initial
 
+    def apply_logged(self, initial, log):
+        log.set(self.index, initial[self.index])
+        initial[self.index] = self.new
+        return initial
+
     def rollback(self, initial):
         return ListSet(self.index, initial[self.index]) if self.index in range(len(initial)) else NoOp()
 
 
 
+@tupleclass(["delta", "repetitions"])
 class Repeat(Delta):
-    def __init__(self, delta, repetitions):
-        self.delta = delta
-        self.repetitions = repetitions
-
     def apply(self, initial):
         current = initial
         for i in range(self.repetitions):
@@ -162,6 +482,11 @@ class ListExtend(Extend):
         initial.extend(self.extension)    
         return initial
 
+    def apply_logged(self, initial, log):
+        log.tail(len(initial))
+        initial.extend(self.extension)
+        return initial
+
     def rollback(self, initial):
         return Repeat(ListPop(), len(self.extension))
 
@@ -175,6 +500,12 @@ class ListInsert(Insert):
         initial.insert(self.index, self.new)
         return initial
 
+    def apply_logged(self, initial, log):
+        index = self.index if self.index >= 0 else max(self.index + len(initial), 0)
+        log.insert(min(index, len(initial)))
+        initial.insert(self.index, self.new)
+        return initial
+
     def rollback(self, initial):
         return ListPopIndex(self.index)
 
@@ -194,13 +525,23 @@ class TupleReplace(Replace):
 
 class TupleAppend(Append):
     def apply(self, initial):
-        return tuple(chain(initial, unit(self.new)))
+        return initial + (self.new,)
 
     def rollback(self, initial):
         return TupleReplace(initial)
 
     
+class TupleTruncate(Truncate):
+    def apply(self, initial):
+        return initial[:max(len(initial) - self.count, 0)]
+
+    def rollback(self, initial):
+        return TupleReplace(initial)
+
+
 class TuplePop(Pop):
+    batch = truncation_batch(TupleTruncate)
+
     def apply(self, initial):
         return initial[:-1]
 
@@ -208,9 +549,41 @@ class TuplePop(Pop):
         return TupleReplace(initial)
 
     
+class TuplePopIndex(PopIndex):
+    def apply(self, initial):
+        elements = list(initial)
+        del elements[self.index]
+        return tuple(elements)
+
+    def rollback(self, initial):
+        return TupleReplace(initial)
+
+
+class TupleUpdate(Update):
+    def apply(self, initial):
+        elements = list(initial)
+        for index, new in self.updates.items():
+            if 0 <= index < len(elements):
+                elements[index] = new
+        return tuple(elements)
+
+    def rollback(self, initial):
+        return TupleReplace(initial)
+
+
+def tuple_update_batch(run):
+    return tuple.__new__(TupleUpdate, (dict(run),))
+
+
 class TupleSet(Set):
+    batch = tuple_update_batch
+
     def apply(self, initial):
-        return tuple(x if i != self.index else self.new for i, x in enumerate(initial))
+        index = self.index
+        # like TupleUpdate, indices out of range are ignored
+        if not 0 <= index < len(initial):
+            return initial
+        return initial[:index] + (self.new,) + initial[index + 1:]
 
     def rollback(self, initial):
         return TupleReplace(initial)
@@ -224,6 +597,15 @@ class TupleExtend(Extend):
         return TupleReplace(initial)
 
 
+ListAppend.batch = ListExtend.batch = extension_batch(ListExtend)
+TupleAppend.batch = TupleExtend.batch = extension_batch(TupleExtend)
+# deltas of mutable containers are cheap to apply one at a time,
+# so merging them only pays for long runs(see benchmarks/evolve_incubator.py);
+# sets of list elements and dict items are not merged at all, as they gain nothing from it
+ListAppend.min_batch = ListExtend.min_batch = 64
+ListPop.min_batch = 32
+
+
 @tupleclass(["start", "stop", "step"])
 class Slice(Delta):
     pass
@@ -236,7 +618,95 @@ class TupleSlice(Slice):
         return TupleReplace(initial)
     
 
+class DictSet(Set):
+    def apply(self, initial):
+        initial[self.index] = self.new
+        return initial
+
+    def rollback(self, initial):
+        return DictSet(self.index, initial[self.index]) if self.index in initial else DictPop(self.index)
+
+
+class DictUpdate(Update):
+    def apply(self, initial):
+        initial.update(self.updates)
+        return initial
+
+
+class DictPop(PopIndex):
+    def apply(self, initial):
+        del initial[self.index]
+        return initial
+
+    def rollback(self, initial):
+        return DictSet(self.index, initial[self.index])
+
+
+@tupleclass(["removed"])
+class Difference(Delta):
+    pass
+
+
+class SetDifference(Difference):
+    def apply(self, initial):
+        initial.difference_update(self.removed)
+        return initial
+
+    def rollback(self, initial):
+        return SetExtend(initial.intersection(self.removed))
+
+
+@tupleclass(["old"])
+class Discard(Delta):
+    pass
+
+
+class SetDiscard(Discard):
+    def apply(self, initial):
+        initial.discard(self.old)
+        return initial
+
+    def rollback(self, initial):
+        return SetAppend(self.old) if self.old in initial else NoOp()
+
+
+class SetAppend(Append):
+    def apply(self, initial):
+        initial.add(self.new)
+        return initial
+
+    def rollback(self, initial):
+        return NoOp() if self.new in initial else SetDiscard(self.new)
+
+
+class SetExtend(Extend):
+    def apply(self, initial):
+        initial.update(self.extension)
+        return initial
+
+    def rollback(self, initial):
+        return SetDifference(set(self.extension).difference(initial))
+
+
+def set_difference_batch(run):
+    removed = set()
+    for cls, group in groupby(run, type):
+        if issubclass(cls, Difference):
+            for d in group:
+                removed.update(d.removed)
+        else:
+            removed.update(map(_first, group))
+    return tuple.__new__(SetDifference, (removed,))
+
+SetAppend.batch = SetExtend.batch = extension_batch(SetExtend)
+SetDiscard.batch = SetDifference.batch = set_difference_batch
+SetAppend.min_batch = SetExtend.min_batch = 64
+SetDiscard.min_batch = SetDifference.min_batch = 32
+
+
 class ListIncubator(Incubator):
+    supports_in_place = True
+
     @classmethod
     def copy(cls, value):
         return value.copy()
@@ -250,6 +720,9 @@ class ListIncubator(Incubator):
 
     def extend(self, extension):
         self.delta.append(ListExtend(extension))
+
+    def insert(self, index, new):
+        self.delta.append(ListInsert(new, index))
         
     def __setitem__(self, index, new):
         self.delta.append(ListSet(index, new))
@@ -264,15 +737,7 @@ class TupleIncubator(Incubator):
         self.delta.append(TupleAppend(x))
 
     def pop(self, index=None):
-        if index is None:
-        count = 0
-        while isinstance(self.delta[-1], Pop):
-            count +=1
-            self.delta.pop()
-        if count > 0:
-            delta = TupleSlice(0, -count, 1)
-        else:
-            delta = TuplePopIndex(index) if index is not None else TuplePop()
+        delta = TuplePopIndex(index) if index is not None else TuplePop()
         self.delta.append(delta)
 
     def extend(self, extension):
@@ -284,6 +749,317 @@ class TupleIncubator(Incubator):
     def slice(self, start, stop, step=1):
         self.delta.append(TupleSlice(start, stop, step))
         
+class DictIncubator(Incubator):
+    @classmethod
+    def copy(cls, value):
+        return value.copy()
+
+    def __setitem__(self, key, new):
+        self.delta.append(DictSet(key, new))
+
+    def __delitem__(self, key):
+        self.delta.append(DictPop(key))
+
+    def update(self, updates):
+        self.delta.append(DictUpdate(dict(updates)))
+
+
+class SetIncubator(Incubator):
+    @classmethod
+    def copy(cls, value):
+        return value.copy()
+
+    def add(self, x):
+        self.delta.append(SetAppend(x))
+
+    def discard(self, x):
+        self.delta.append(SetDiscard(x))
+
+    def update(self, extension):
+        self.delta.append(SetExtend(extension))
+
+    def difference_update(self, removed):
+        self.delta.append(SetDifference(set(removed)))
+
+
+
+# Binary journal format:
+# the magic bytes, followed by entries, each made of the entry tag, the number of deltas(varint),
+# and runs of deltas of a same class, each made of the code of the class in DELTA_TYPES,
+# the length of the run(varint), the number of fields of its deltas, 
+# and its fields: the fields of the delta for a run of one, and a column of values per field otherwise,
+# so that columns of ints are packed.
+# Values are encoded as a tag byte followed by a payload, 
+# ints and lengths as varints(ints zigzag-encoded), other numbers little-endian,
+# with pickle as a fallback for values of other types.
+# Deltas of other classes are pickled one by one.
+
+JOURNAL_MAGIC = b"FKJ2"
+
+# delta classes by code; only append to this list, to keep reading older journals
+DELTA_TYPES = [
+    NoOp, ListAppend, ListPop, ListPopIndex, ListSet, ListUpdate, ListTruncate, ListExtend, ListInsert,
+    Repeat, TupleReplace, TupleAppend, TupleTruncate, TuplePop, TuplePopIndex, TupleUpdate, TupleSet,
+    TupleExtend, TupleSlice, DictSet, DictUpdate, DictPop, SetDifference, SetDiscard, SetAppend, SetExtend
+]
+DELTA_CODES = {cls: code for code, cls in enumerate(DELTA_TYPES)}
+PICKLED_DELTA = 255
+
+_float = struct.Struct("<d")
+
+
+# typecodes of signed integer arrays by item size
+_int_typecodes = {array(t).itemsize: t for t in "qihb"}
+
+
+def _int_array(values):
+    """Values as a little-endian array of the smallest signed integer type holding them,
+    if they are all ints in the int64 range, else None"""
+    if not all(type(x) is int for x in values):
+        return None
+    low, high = min(values), max(values)
+    for size in (1, 2, 4, 8):
+        if -2**(8*size - 1) <= low and high < 2**(8*size - 1):
+            break
+    else:
+        return None
+    a = array(_int_typecodes[size], values)
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a
+
+
+def encode_varint(n, out):
+    """Append the varint encoding of natural number n to bytearray out: 7 bits per byte, low bits first"""
+    while n > 0x7f:
+        out.append(n & 0x7f | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def decode_varint(data, pos):
+    """Decode the varint in data at pos, returning it and the position after it"""
+    n = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _is_pairs(value):
+    return len(value) > 1 and all(type(x) is tuple and len(x) == 2 for x in value)
+
+
+def encode_value(value, out):
+    """Append the binary encoding of value to bytearray out"""
+    t = type(value)
+    if value is None:
+        out += b"N"
+    elif t is bool:
+        out += b"T" if value else b"F"
+    elif t is int:
+        out += b"i"
+        # zigzag encoding, so that small negative ints are short too
+        encode_varint(2*value if value >= 0 else -2*value - 1, out)
+    elif t is float:
+        out += b"d"
+        out += _float.pack(value)
+    elif t is str or t is bytes:
+        data = value.encode("utf-8") if t is str else value
+        out += b"s" if t is str else b"b"
+        encode_varint(len(data), out)
+        out += data
+    elif t is list or t is tuple:
+        ints = _int_array(value) if len(value) > 0 else None
+        if ints is not None:
+            out += b"I" if t is list else b"J"
+            encode_varint(len(value), out)
+            out.append(ints.itemsize)
+            out += ints.tobytes()
+        elif t is list and _is_pairs(value):
+            # e.g. the (index, value) updates of ListUpdate, as two columns
+            out += b"P"
+            first, second = zip(*value)
+            encode_value(list(first), out)
+            encode_value(list(second), out)
+        else:
+            out += b"l" if t is list else b"t"
+            encode_varint(len(value), out)
+            for x in value:
+                encode_value(x, out)
+    elif t is dict:
+        out += b"m"
+        encode_value(list(value), out)
+        encode_value(list(value.values()), out)
+    elif t is set:
+        out += b"S"
+        encode_value(list(value), out)
+    elif isinstance(value, Delta):
+        out += b"D"
+        encode_delta(value, out)
+    else:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        out += b"p"
+        encode_varint(len(data), out)
+        out += data
+
+
+def decode_value(data, pos):
+    """Decode the value encoded in data at pos, returning it and the position after it"""
+    tag = data[pos:pos + 1]
+    pos += 1
+    if tag == b"N":
+        return None, pos
+    elif tag == b"T":
+        return True, pos
+    elif tag == b"F":
+        return False, pos
+    elif tag == b"i":
+        z, pos = decode_varint(data, pos)
+        return (z >> 1) ^ -(z & 1), pos
+    elif tag == b"d":
+        return _float.unpack_from(data, pos)[0], pos + 8
+    elif tag == b"D":
+        return decode_delta(data, pos)
+    elif tag == b"P":
+        first, pos = decode_value(data, pos)
+        second, pos = decode_value(data, pos)
+        return list(zip(first, second)), pos
+    elif tag == b"m":
+        keys, pos = decode_value(data, pos)
+        values, pos = decode_value(data, pos)
+        return dict(zip(keys, values)), pos
+    elif tag == b"S":
+        elements, pos = decode_value(data, pos)
+        return set(elements), pos
+    n, pos = decode_varint(data, pos)
+    if tag == b"s":
+        return bytes(data[pos:pos + n]).decode("utf-8"), pos + n
+    elif tag == b"b":
+        return bytes(data[pos:pos + n]), pos + n
+    elif tag == b"p":
+        return pickle.loads(data[pos:pos + n]), pos + n
+    elif tag == b"I" or tag == b"J":
+        size = data[pos]
+        pos += 1
+        a = array(_int_typecodes[size])
+        a.frombytes(data[pos:pos + size*n])
+        if sys.byteorder == "big":
+            a.byteswap()
+        return (a.tolist() if tag == b"I" else tuple(a)), pos + size*n
+    elif tag == b"l" or tag == b"t":
+        values = []
+        for _ in range(n):
+            x, pos = decode_value(data, pos)
+            values.append(x)
+        return (values if tag == b"l" else tuple(values)), pos
+    else:
+        raise ValueError("Invalid journal value tag {!r} at {}".format(tag, pos - 1))
+
+
+def _encode_pickled_delta(delta, out):
+    out.append(PICKLED_DELTA)
+    data = pickle.dumps(delta, protocol=pickle.HIGHEST_PROTOCOL)
+    encode_varint(len(data), out)
+    out += data
+
+
+def encode_delta(delta, out):
+    """Append the binary encoding of a single delta to bytearray out"""
+    code = DELTA_CODES.get(type(delta))
+    if code is None:
+        _encode_pickled_delta(delta, out)
+    else:
+        out.append(code)
+        out.append(len(delta))
+        for field in delta:
+            encode_value(field, out)
+
+
+def decode_delta(data, pos):
+    """Decode the single delta encoded in data at pos, returning it and the position after it"""
+    code = data[pos]
+    pos += 1
+    if code == PICKLED_DELTA:
+        n, pos = decode_varint(data, pos)
+        return pickle.loads(data[pos:pos + n]), pos + n
+    n = data[pos]
+    pos += 1
+    fields = []
+    for _ in range(n):
+        x, pos = decode_value(data, pos)
+        fields.append(x)
+    return tuple.__new__(DELTA_TYPES[code], fields), pos
+
+
+def encode_entry(deltas):
+    """Binary encoding of a journal entry"""
+    deltas = tuple(deltas)
+    out = bytearray(b"E")
+    encode_varint(len(deltas), out)
+    for cls, group in groupby(deltas, type):
+        code = DELTA_CODES.get(cls)
+        if code is None:
+            for delta in group:
+                _encode_pickled_delta(delta, out)
+            continue
+        run = list(group)
+        out.append(code)
+        encode_varint(len(run), out)
+        out.append(len(run[0]))
+        if len(run) == 1:
+            for field in run[0]:
+                encode_value(field, out)
+        else:
+            for column in zip(*run):
+                encode_value(list(column), out)
+    return bytes(out)
+
+
+def _decode_run(data, pos):
+    """Decode the run of deltas encoded in data at pos, returning it and the position after it"""
+    code = data[pos]
+    if code == PICKLED_DELTA:
+        delta, pos = decode_delta(data, pos)
+        return (delta,), pos
+    cls = DELTA_TYPES[code]
+    k, pos = decode_varint(data, pos + 1)
+    n = data[pos]
+    pos += 1
+    if k == 1:
+        fields = []
+        for _ in range(n):
+            x, pos = decode_value(data, pos)
+            fields.append(x)
+        return (tuple.__new__(cls, fields),), pos
+    columns = []
+    for _ in range(n):
+        column, pos = decode_value(data, pos)
+        columns.append(column)
+    rows = zip(*columns) if n > 0 else [()] * k
+    return [tuple.__new__(cls, row) for row in rows], pos
+
+
+def decode_entries(data):
+    """Iterate over the entries of a journal in binary format"""
+    data = memoryview(data)
+    if bytes(data[:len(JOURNAL_MAGIC)]) != JOURNAL_MAGIC:
+        raise ValueError("Not a journal: invalid header")
+    pos = len(JOURNAL_MAGIC)
+    while pos < len(data):
+        if data[pos:pos + 1] != b"E":
+            raise ValueError("Invalid journal entry at {}".format(pos))
+        n, pos = decode_varint(data, pos + 1)
+        entry = []
+        while len(entry) < n:
+            run, pos = _decode_run(data, pos)
+            entry.extend(run)
+        yield tuple(entry)
+
+        
 if __name__ == "__main__":
     x = []
     i = ListIncubator(x)
@@ -1,7 +1,9 @@
 from abc import (ABC, ABCMeta, abstractmethod)
 #from typing import *
-from itertools import (tee,)
+from functools import wraps
+from types import GeneratorType
 from .adt import data
+from .trampoline import Bounce
 from ..currying import curry
 from .functionals import Monad
 
@@ -60,22 +62,44 @@ class Failable(data):
     def collect(failables):
         """Try and collect all Success values into one,
         or return the first fail if any"""
-        (failables, failables2) = tee(failables)
-        if any(x.is_failure() for x in failables):
-            return next(x for x in failables2 if x.is_failure())
-        else:
-            return Success(tuple(x.value for x in failables2))
+        values = []
+        for x in failables:
+            if x.is_failure():
+                return x
+            values.append(x.value)
+        return Success(tuple(values))
 
 
     @staticmethod
     def collect_all(failables):
         """Try and collect all Success values into one,
         or returns a fail containing all Failure values"""
-        (failables, failables2) = tee(failables)
-        if any(x.is_failure() for x in failables):
-            return Failure(tuple(x.value for x in failables2 if x.is_failure()))
+        values = []
+        errors = []
+        for x in failables:
+            if x.is_failure():
+                if not errors:
+                    values = None # success values won't be needed anymore
+                errors.append(x.value)
+            elif not errors:
+                values.append(x.value)
+        if errors:
+            return Failure(tuple(errors))
         else:
-            return Success(tuple(x.value for x in failables2))
+            return Success(tuple(values))
+
+    @staticmethod
+    def partition(failables):
+        """Separate the Success values from the Failure values,
+        in a single pass. Returns a pair of tuples (successes, failures)"""
+        values = []
+        errors = []
+        for x in failables:
+            if x.is_failure():
+                errors.append(x.value)
+            else:
+                values.append(x.value)
+        return tuple(values), tuple(errors)
 
     @staticmethod
     def successes(failables):
@@ -131,7 +155,7 @@ class Failable(data):
     
 
         
-class Failure(Failable):
+class Failure(Failable, interned=True):
     _fields = ("value",)
 
     def is_failure(self):
@@ -177,7 +201,7 @@ class Failure(Failable):
             yield None
         return self.value
     
-class Success(Failable):
+class Success(Failable, interned=True):
     _fields = ("value",)
     
     def is_failure(self):
@@ -217,3 +241,93 @@ class Success(Failable):
             return other
         else:
             raise TypeError("unsupported operand type(s) for +: '{}' and '{}'".format(type(self).__name__, type(other).__name__))
+
+
+# preallocated instances for common payloads,
+# more can be registered with `Success.intern` and `Failure.intern`
+for constant in (None, True, False):
+    Success.intern(constant)
+Failure.intern(None)
+
+
+def run_failable(program):
+    """
+    Run a failable program, a generator yielding failable values.
+    The value of each Success is sent back into the generator,
+    and the first Failure stops the program and is returned.
+    The program can also yield other programs(generators, or bounces to `FailableProgram`s),
+    which are run in place, their return value being sent back.
+    Exceptions raised by a sub-program are thrown into the program which yielded it, like with `yield from`.
+    Programs are driven iteratively, so arbitrarily deep sub-programs don't consume the stack.
+    The return value of the program is wrapped in a Success.
+    """
+    stack = [program]
+    value = None
+    error = None
+    while stack:
+        try:
+            if error is None:
+                x = stack[-1].send(value)
+            else:
+                exception, error = error, None
+                x = stack[-1].throw(exception)
+        except StopIteration as ex:
+            stack.pop()
+            value = ex.value
+            continue
+        except Exception as ex:
+            stack.pop()
+            if not stack:
+                raise
+            error = ex
+            continue
+        t = type(x)
+        if t is Success:
+            value = x.value
+        elif t is Failure:
+            while stack:
+                stack.pop().close()
+            return x
+        elif t is Bounce:
+            try:
+                stack.append(x.resume())
+            except Exception as ex:
+                error = ex
+            value = None
+        elif t is GeneratorType:
+            stack.append(x)
+            value = None
+        elif isinstance(x, Failable):
+            if x.is_failure():
+                while stack:
+                    stack.pop().close()
+                return x
+            value = x.value
+        else:
+            raise TypeError("Failable program yielded {!r}, expected a failable value or program".format(x))
+    return Success(value)
+
+
+class FailableProgram:
+    """
+    Wrapper class for failable programs,
+    to use with `trampoline.bounce` from other programs
+    """
+    def __init__(self, func):
+        self.func = func
+        wraps(func)(self)
+
+    def jump(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def __call__(self, *args, **kwargs):
+        return run_failable(self.jump(*args, **kwargs))
+
+
+def failable_program(f):
+    """
+    Make a failable computation from a generator function,
+    run with `run_failable` when called.
+    Other programs can be invoked iteratively by yielding `bounce(program, *args)`.
+    """
+    return FailableProgram(f)
@@ -1,7 +1,11 @@
 import functools as ft
 import itertools as it
+import weakref
+import threading
+import asyncio
 from .adt import data
 from .functionals import Monad
+from .listview import ListSlice
 from ..patmat import MatchFailure
 
 class Cons(data):
@@ -12,7 +16,7 @@ class Cons(data):
 
 
 @Monad.register
-class Empty(data, cached=True, maxsize=1):
+class Empty(data):
     _fields = ()
     
     def __repr__(self):
@@ -115,16 +119,25 @@ class List(Cons):
 
     def __len__(self):
         return sum(1 for x in self)
+
+    def __reversed__(self):
+        return reversed(tuple(self))
     
+    def view(self, index):
+        """
+        Readonly `ListSlice` view of a slice of the list, sharing its cells,
+        which is only copied into a new list with `to_list()`
+        """
+        start, stop, step = slice_bounds(index)
+        return ListSlice(self.drop(start), None if stop is None else max(stop - start, 0), step, type(self))
+
     def __getitem__(self, index):
         if isinstance(index, slice):
-            start = index.start or 0            
-            x = self.drop(start)
-            y = x if index.stop == None else x.take(index.stop-start)
-            if index.step == None or index.step == 1:
-                return y
+            start, stop, step = slice_bounds(index)
+            if stop is None and step == 1:
+                return self.drop(start)
             else:
-                return type(self).from_iterable(a for (i, a) in enumerate(y) if i%index.step == 0)
+                return self.view(index).to_list()
         elif index >= 0:
             for (i, x) in enumerate(self):
                 if i == index:
@@ -175,12 +188,74 @@ class List(Cons):
     def drop(self, n):
         tail = self
         for x in range(n):
+            if tail.is_empty():
+                break
             tail = tail.tail
         return tail
 
+def slice_bounds(index):
+    """Start, stop and step of a slice of a linked list, 
+    which can't be indexed from the end"""
+    start = index.start or 0
+    step = 1 if index.step is None else index.step
+    if start < 0 or (index.stop is not None and index.stop < 0) or step < 1:
+        raise TypeError("Invalid slice: expected natural numbers")
+    return start, index.stop, step
+
+
+@Monad.register
+class SizedList(List):
+    """Linked list storing in each cell the length of the list starting there,
+    for constant time `len`"""
+    _fields = ("car", "cdr", "size")
+
+    class SizedEmpty(Empty):
+        def prepend(self, x):
+            return SizedList(x)
+
+    Empty = SizedEmpty()
+
+    def __new__(cls, *elements):
+        tail = cls.Empty
+        size = 0
+        for x in reversed(elements):
+            size += 1
+            tail = tuple.__new__(cls, (x, tail, size))
+        return tail
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice) or index < 0:
+            return super().__getitem__(index)
+        elif index >= self.size:
+            raise IndexError("List index out of bounds")
+        else:
+            return self.drop(index).head
+
+    def __repr__(self):
+        return "SizedList({})".format(", ".join(map(str, self)))
+
+    def prepend(self, x):
+        return tuple.__new__(type(self), (x, self, self.size + 1))
+
+    def __add__(self, other):
+        if not isinstance(other, (SizedList, SizedList.SizedEmpty)):
+            other = type(self).from_iterable(other)
+        return ft.reduce(type(self).prepend, reversed(self), other)
+
+    def drop(self, n):
+        if n >= self.size:
+            return type(self).Empty
+        return super().drop(n)
+
+
 class suspended:
-    """Data type for cachable suspended computations"""
-    __slots__ = ['_thunk', '_cached', '_value']
+    """Data type for cachable suspended computations.
+    The thunk is released once computed, 
+    so that whatever it refers to(iterators, upstream cells) can be garbage collected"""
+    __slots__ = ['_thunk', '_cached', '_value', '__weakref__']
     def __init__(self, thunk):
         self._thunk = thunk
         self._cached = False
@@ -200,8 +275,13 @@ class suspended:
         
     def compute(self):
         """Resume the suspended computation, caching the result"""
+        if self._cached:
+            return self._value
+        elif isinstance(self._thunk, deferred):
+            return force(self)
         self._value = self._thunk()
         self._cached = True
+        self._thunk = None
         return self._value
     
     def __call__(self):
@@ -210,6 +290,246 @@ class suspended:
 
     def __repr__(self):
         return "<suspended {!r}: {!s}>".format(self._thunk, self._value if self._cached else "<not computed>")
+
+
+class synchronized(suspended):
+    """Suspended computation evaluated at most once, 
+    even when forced concurrently by several threads: 
+    each instance has its own lock, held while it is being evaluated.
+    Forcing it again from its own evaluation(a cycle) raises RuntimeError"""
+    __slots__ = ['_lock', '_forcing']
+    def __init__(self, thunk):
+        super().__init__(thunk)
+        self._lock = threading.RLock()
+        self._forcing = False
+
+    def compute(self):
+        return force(self)
+
+
+class async_suspended:
+    """
+    Suspended asynchronous computation, from a coroutine function taking no argument.
+    Awaiting it starts the computation on the first await only: 
+    concurrent awaiters share the same task, 
+    and later ones get the cached result(or exception).
+    Cancelling an awaiter doesn't cancel the shared computation.
+    """
+    __slots__ = ['_thunk', '_task']
+    def __init__(self, thunk):
+        self._thunk = thunk
+        self._task = None
+
+    def is_cached(self):
+        return self._task is not None and self._task.done() and not self._task.cancelled()
+
+    def __await__(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._thunk())
+            self._thunk = None
+        return asyncio.shield(self._task).__await__()
+
+    def __repr__(self):
+        return "<async_suspended {!r}: {!s}>".format(
+            self._thunk, self._task.result() if self.is_cached() and self._task.exception() is None 
+            else "<not computed>"
+        )
+
+
+def evaluated(value):
+    """Suspended computation already evaluated to value"""
+    s = suspended(None)
+    s._value = value
+    s._cached = True
+    return s
+
+
+class deferred:
+    """
+    Thunk for a lazy list operation depending on other suspended computations.
+    Instead of forcing its dependencies itself(recursively), 
+    it declares them to `force`, which evaluates them iteratively before resuming it.
+    """
+    __slots__ = ()
+
+    def dependency(self):
+        """Returns an unevaluated suspended computation needed to resume, 
+        or None if ready"""
+        return None
+
+    def resume(self):
+        """Compute the result, once all dependencies are evaluated.
+        May return another `deferred` to continue with."""
+        raise NotImplementedError()
+
+
+def _acquire(s):
+    """Take the lock of synchronized computation s, 
+    which must not already be under evaluation by the current thread"""
+    s._lock.acquire()
+    # the lock is reentrant, so only the thread evaluating s can find it forcing
+    if s._forcing:
+        s._lock.release()
+        raise RuntimeError("Cyclic evaluation of {!r}".format(s))
+    s._forcing = True
+
+
+def _release(s):
+    s._forcing = False
+    s._lock.release()
+
+
+def force(s):
+    """Evaluate suspended computation s, 
+    driving chains of `deferred` thunks with an explicit stack, like a trampoline.
+    The locks of `synchronized` computations are held while they are on the stack,
+    in the order of dependencies, so concurrent evaluations of a same computation can't deadlock."""
+    if type(s) is not suspended:
+        _acquire(s)
+    stack = [s]
+    try:
+        while stack:
+            top = stack[-1]
+            if top._cached:
+                stack.pop()
+                if type(top) is not suspended:
+                    _release(top)
+                continue
+            thunk = top._thunk
+            if not isinstance(thunk, deferred):
+                top._value = thunk()
+                top._cached = True
+                top._thunk = None
+                continue
+            dependency = thunk.dependency()
+            if dependency is not None:
+                if type(dependency) is not suspended:
+                    _acquire(dependency)
+                stack.append(dependency)
+                continue
+            result = thunk.resume()
+            if isinstance(result, deferred):
+                top._thunk = result
+            else:
+                top._value = result
+                top._cached = True
+                top._thunk = None
+    finally:
+        for x in stack:
+            if type(x) is not suspended:
+                _release(x)
+    return s._value
+
+
+class mapped(deferred):
+    """Tail of a lazy list mapped with a function"""
+    __slots__ = ("cls", "f", "source")
+
+    def __init__(self, cls, f, source):
+        self.cls = cls
+        self.f = f
+        self.source = source
+
+    def dependency(self):
+        return None if self.source._cached else self.source
+
+    def resume(self):
+        cell = self.source._value
+        if cell.is_empty():
+            return self.cls.Empty
+        return Cons.__new__(self.cls, self.f(cell.head), self.cls.suspension(mapped(self.cls, self.f, cell.cdr)))
+
+
+class taken(deferred):
+    """First n elements of a suspended lazy list"""
+    __slots__ = ("cls", "n", "source")
+
+    def __init__(self, cls, n, source):
+        self.cls = cls
+        self.n = n
+        self.source = source
+
+    def dependency(self):
+        return None if self.n <= 0 or self.source._cached else self.source
+
+    def resume(self):
+        if self.n <= 0:
+            return self.cls.Empty
+        cell = self.source._value
+        if cell.is_empty():
+            return cell
+        return Cons.__new__(self.cls, cell.head, self.cls.suspension(taken(self.cls, self.n - 1, cell.cdr)))
+
+
+class concatenated(deferred):
+    """
+    Concatenation of suspended lazy lists.
+    The lists after the first are kept in a persistent queue(a front list and a reversed back list),
+    so that appending to an unevaluated concatenation adds to its queue 
+    instead of nesting thunks, which would make repeated appends quadratic.
+    """
+    __slots__ = ("cls", "left", "front", "back")
+
+    def __init__(self, cls, left, front, back=None):
+        self.cls = cls
+        self.left = left
+        self.front = front
+        self.back = back
+
+    @classmethod
+    def of(cls, list_cls, left, right):
+        """Concatenation of suspended lazy lists left and right"""
+        if not left._cached and type(left._thunk) is cls:
+            thunk = left._thunk
+            return cls(list_cls, thunk.left, thunk.front, (right, thunk.back))
+        return cls(list_cls, left, (right, None))
+
+    def dependency(self):
+        if not self.left._cached:
+            return self.left
+        elif self.left._value.is_empty() and not self.front[0]._cached:
+            return self.front[0]
+        else:
+            return None
+
+    def resume(self):
+        cell = self.left._value
+        if not cell.is_empty():
+            return self.cell(cell)
+        right, front = self.front
+        back = self.back
+        if front is None:
+            while back is not None:
+                x, back = back
+                front = (x, front)
+        if front is None:
+            return right._value
+        return type(self)(self.cls, right, front, back)
+
+    def cell(self, cell):
+        """First cell of the concatenation, given the first cell of the left list"""
+        return Cons.__new__(self.cls, cell.head, self.cls.suspension(
+            type(self)(self.cls, cell.cdr, self.front, self.back)
+        ))
+
+
+class joined(deferred):
+    """Concatenation of the lists in a suspended lazy list"""
+    __slots__ = ("cls", "source")
+
+    def __init__(self, cls, source):
+        self.cls = cls
+        self.source = source
+
+    def dependency(self):
+        return None if self.source._cached else self.source
+
+    def resume(self):
+        cell = self.source._value
+        if cell.is_empty():
+            return self.cls.Empty
+        return concatenated.of(self.cls, evaluated(self.cls.from_iterable(cell.head)), self.cls.suspension(joined(self.cls, cell.cdr)))
+
     
 class LazyList(List):    
     
@@ -217,30 +537,54 @@ class LazyList(List):
         def prepend(self, x):
             return LazyList(x)
 
+        def join(self):
+            return self
+
     Empty = LazyEmpty()
+
+    suspension = suspended
     
     def __new__(cls, *elements):
         return cls.from_iterable(elements)
         
     @classmethod
-    def from_iterable(cls, iterable):
+    def from_iterable(cls, iterable, monitor=None):
+        """Lazy list of the elements of iterable, 
+        optionally reporting its cells to a `RetentionMonitor`"""
+        if isinstance(iterable, (cls, cls.LazyEmpty)):
+            return iterable
         iterator = iter(iterable)
         try:
-            return Cons.__new__(cls, next(iterator), suspended(lambda: cls.from_iterable(iterator)))
+            head = next(iterator)
         except StopIteration:
             return cls.Empty
+        tail = cls.suspension(lambda: cls.from_iterable(iterator, monitor))
+        if monitor is not None:
+            monitor.track(tail)
+        return Cons.__new__(cls, head, tail)
+
+    @classmethod
+    def stream(cls, iterable, monitor=None):
+        """Cursor over a lazy list of the elements of iterable, 
+        the only reference to the head of the list, 
+        so that iterating over it runs in constant memory"""
+        return LazyCursor(cls.from_iterable(iterable, monitor))
  
     @property
     def tail(self):
         return self.cdr.value
+
+    def __iter__(self):
+        return LazyCursor(self)
     
     def __repr__(self):        
-        def evaluated(suscomp):
-            if suscomp.is_cached():
-                yield suscomp.value
-                if not suscomp.value.is_empty():
-                    yield from evaluated(suscomp.value.cdr)
-        precomputed = list(evaluated(self.cdr))
+        precomputed = []
+        s = self.cdr
+        while s.is_cached():
+            precomputed.append(s.value)
+            if s.value.is_empty():
+                break
+            s = s.value.cdr
         if len(precomputed) > 0 and precomputed[-1].is_empty():
             return "LazyList({}, {})".format(self.head, ", ".join(str(x.head) for x in precomputed if not x.is_empty()))
         elif len(precomputed) > 0:
@@ -250,19 +594,341 @@ class LazyList(List):
         
     
     def __add__(self, other):
-        return Cons.__new__(type(self), self.head, suspended(lambda: self.tail + other))
+        cls = type(self)
+        return Cons.__new__(cls, self.head, cls.suspension(concatenated.of(
+            cls, self.cdr, cls.suspension(lambda: cls.from_iterable(other))
+        )))
 
     def prepend(self, x):
-        return Cons.__new__(type(self), x, suspended(lambda: self))
+        return Cons.__new__(type(self), x, evaluated(self))
 
     def join(self):
-        return Cons.__new__(type(self), self.head.head, suspended(lambda: self.head.tail + self.tail.join()))
+        return suspended(joined(type(self), evaluated(self))).value
     
     def then(self, f):
-        x = f(self.head)
-        return Cons.__new__(type(self), x.head, suspended(lambda: x.head.tail + self.tail.then(f)))
+        return self.fmap(f).join()
     
     def fmap(self, f):
-        return Cons.__new__(type(self), f(self.head), suspended(lambda: self.tail.fmap(f)))
+        return Cons.__new__(type(self), f(self.head), type(self).suspension(mapped(type(self), f, self.cdr)))
 
-    
+    def take(self, n):
+        if n <= 0:
+            return type(self).Empty
+        return Cons.__new__(type(self), self.head, type(self).suspension(taken(type(self), n - 1, self.cdr)))
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return super().__getitem__(index)
+        start, stop, step = slice_bounds(index)
+        x = self.drop(start)
+        if stop is not None and not x.is_empty():
+            x = x.take(stop - start)
+        if step != 1 and not x.is_empty():
+            x = type(self).from_iterable(it.islice(x, 0, None, step))
+        return x
+
+
+class chunk_mapped(deferred):
+    """Tail of a chunked lazy list mapped with a function"""
+    __slots__ = ("cls", "f", "source")
+
+    def __init__(self, cls, f, source):
+        self.cls = cls
+        self.f = f
+        self.source = source
+
+    def dependency(self):
+        return None if self.source._cached else self.source
+
+    def resume(self):
+        node = self.source._value
+        if node.is_empty():
+            return self.cls.Empty
+        return tuple.__new__(self.cls, (
+            tuple(map(self.f, it.islice(node.chunk, node.offset, None))), 0,
+            self.cls.suspension(chunk_mapped(self.cls, self.f, node.rest))
+        ))
+
+
+class chunk_concatenated(concatenated):
+    """Concatenation of suspended chunked lazy lists, sharing their chunks"""
+    __slots__ = ()
+
+    def cell(self, node):
+        return tuple.__new__(self.cls, (node.chunk, node.offset, self.cls.suspension(
+            type(self)(self.cls, node.rest, self.front, self.back)
+        )))
+
+
+class chunk_taken(deferred):
+    """First n elements of a suspended chunked lazy list, sharing its chunks"""
+    __slots__ = ("cls", "n", "source")
+
+    def __init__(self, cls, n, source):
+        self.cls = cls
+        self.n = n
+        self.source = source
+
+    def dependency(self):
+        return None if self.n <= 0 or self.source._cached else self.source
+
+    def resume(self):
+        if self.n <= 0:
+            return self.cls.Empty
+        return self.cls._taken(self.source._value, self.n)
+
+
+class chunk_joined(deferred):
+    """Concatenation of the lists in a suspended chunked lazy list"""
+    __slots__ = ("cls", "source")
+
+    def __init__(self, cls, source):
+        self.cls = cls
+        self.source = source
+
+    def dependency(self):
+        return None if self.source._cached else self.source
+
+    def resume(self):
+        node = self.source._value
+        if node.is_empty():
+            return self.cls.Empty
+        return chunk_concatenated.of(
+            self.cls, evaluated(self.cls.from_iterable(node.head)),
+            self.cls.suspension(chunk_joined(self.cls, node.cdr))
+        )
+
+
+class SharedLazyList(LazyList):
+    """
+    Lazy list which can be shared between threads:
+    each tail is `synchronized`, so it is evaluated once, by a single thread.
+    In particular, the underlying iterator of a list built with `from_iterable` 
+    is advanced once per element, whichever threads traverse the list.
+    """
+    class SharedEmpty(LazyList.LazyEmpty):
+        def prepend(self, x):
+            return SharedLazyList(x)
+
+    Empty = SharedEmpty()
+
+    suspension = synchronized
+
+
+class ChunkedLazyList(LazyList):
+    """
+    Lazy list pulling elements from its source in chunks of `chunk_size` elements.
+    Each node holds a tuple of elements, the offset of its head in that tuple,
+    and the suspended rest of the list after the chunk, 
+    so a single node and thunk are allocated per chunk instead of per element.
+    """
+    _fields = ("chunk", "offset", "rest")
+    chunk_size = 64
+
+    class ChunkedEmpty(LazyList.LazyEmpty):
+        def prepend(self, x):
+            return ChunkedLazyList(x)
+
+    Empty = ChunkedEmpty()
+
+    def __new__(cls, *elements):
+        return cls.from_iterable(elements)
+
+    @classmethod
+    def from_iterable(cls, iterable, monitor=None, chunk_size=None):
+        if isinstance(iterable, (cls, cls.ChunkedEmpty)):
+            return iterable
+        return cls._pull(iter(iterable), chunk_size or cls.chunk_size, monitor)
+
+    @classmethod
+    def stream(cls, iterable, monitor=None, chunk_size=None):
+        return _iterate_chunked(evaluated(cls.from_iterable(iterable, monitor, chunk_size)))
+
+    @classmethod
+    def _pull(cls, iterator, chunk_size, monitor):
+        chunk = tuple(it.islice(iterator, chunk_size))
+        if len(chunk) == 0:
+            return cls.Empty
+        rest = cls.suspension(lambda: cls._pull(iterator, chunk_size, monitor))
+        if monitor is not None:
+            monitor.track(rest)
+        return tuple.__new__(cls, (chunk, 0, rest))
+
+    @property
+    def head(self):
+        return self.chunk[self.offset]
+
+    car = head
+
+    @property
+    def tail(self):
+        chunk, offset, rest = tuple.__iter__(self)
+        if offset + 1 < len(chunk):
+            return tuple.__new__(type(self), (chunk, offset + 1, rest))
+        return rest.value
+
+    @property
+    def cdr(self):
+        chunk, offset, rest = tuple.__iter__(self)
+        if offset + 1 < len(chunk):
+            return evaluated(tuple.__new__(type(self), (chunk, offset + 1, rest)))
+        return rest
+
+    def chunks(self):
+        """Iterate over the chunks of the list, the first one starting at the head"""
+        node = self
+        while not node.is_empty():
+            yield node.chunk[node.offset:]
+            node = node.rest.value
+
+    def __iter__(self):
+        return _iterate_chunked(evaluated(self))
+
+    def __repr__(self):
+        elements = list(it.islice(self.chunk, self.offset, None))
+        s = self.rest
+        while s.is_cached() and not s.value.is_empty():
+            elements.extend(s.value.chunk)
+            s = s.value.rest
+        return "ChunkedLazyList({}{})".format(
+            ", ".join(map(str, elements)), "" if s.is_cached() else ", ..."
+        )
+
+    def __add__(self, other):
+        cls = type(self)
+        return tuple.__new__(cls, (self.chunk, self.offset, cls.suspension(chunk_concatenated.of(
+            cls, self.rest, cls.suspension(lambda: cls.from_iterable(other))
+        ))))
+
+    def prepend(self, x):
+        return tuple.__new__(type(self), ((x,), 0, evaluated(self)))
+
+    def join(self):
+        return suspended(chunk_joined(type(self), evaluated(self))).value
+
+    def fmap(self, f):
+        cls = type(self)
+        return tuple.__new__(cls, (
+            tuple(map(f, it.islice(self.chunk, self.offset, None))), 0,
+            cls.suspension(chunk_mapped(cls, f, self.rest))
+        ))
+
+    def take(self, n):
+        return type(self)._taken(self, n)
+
+    @classmethod
+    def _taken(cls, node, n):
+        if n <= 0 or node.is_empty():
+            return cls.Empty
+        chunk, offset, rest = tuple.__iter__(node)
+        if len(chunk) - offset > n:
+            return tuple.__new__(cls, (chunk[offset:offset + n], 0, evaluated(cls.Empty)))
+        return tuple.__new__(cls, (chunk, offset, cls.suspension(chunk_taken(cls, n - len(chunk) + offset, rest))))
+
+    def drop(self, n):
+        node = self
+        while n > 0 and not node.is_empty():
+            remaining = len(node.chunk) - node.offset
+            if n < remaining:
+                return tuple.__new__(type(self), (node.chunk, node.offset + n, node.rest))
+            n -= remaining
+            node = node.rest.value
+        return node
+
+
+def _iterate_chunked(rest):
+    """Iterate over the suspended chunked lazy list rest, 
+    only holding a reference to the current node"""
+    while True:
+        node = rest.value
+        if node.is_empty():
+            return
+        rest = node.rest
+        yield from it.islice(node.chunk, node.offset, None)
+
+
+class LazyCursor:
+    """
+    Iterator over a lazy list, holding a reference to the suspended rest of the list only.
+    Cells are evaluated as the cursor advances, 
+    and consumed cells can be garbage collected if not referenced elsewhere.
+    """
+    __slots__ = ["_rest", "_position"]
+
+    def __init__(self, lazylist, position=0):
+        self._rest = evaluated(lazylist)
+        self._position = position
+
+    @property
+    def position(self):
+        """Number of elements consumed"""
+        return self._position
+
+    @property
+    def rest(self):
+        """The lazy list of the remaining elements"""
+        return self._rest.value
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        cell = self._rest.value
+        if cell.is_empty():
+            raise StopIteration()
+        self._rest = cell.cdr
+        self._position += 1
+        return cell.head
+
+    def drop(self, n):
+        """Skip n elements, returning the cursor"""
+        for _ in it.islice(self, n):
+            pass
+        return self
+
+    def fork(self):
+        """Independent cursor at the same position, sharing the remaining cells.
+        Cells are retained until the slowest cursor has consumed them."""
+        cursor = LazyCursor.__new__(LazyCursor)
+        cursor._rest = self._rest
+        cursor._position = self._position
+        return cursor
+
+    def __repr__(self):
+        return "<LazyCursor at {}: {!r}>".format(self._position, self._rest)
+
+
+class RetentionMonitor:
+    """
+    Instrumentation counting the cells of lazy lists built with it 
+    which are still in memory, to check that a traversal doesn't retain consumed cells.
+    The count is approximate by one, since a cell's suspended tail is what is tracked.
+    """
+    __slots__ = ["_created", "_released", "_refs", "__weakref__"]
+
+    def __init__(self):
+        self._created = 0
+        self._released = 0
+        self._refs = set()
+
+    def track(self, s):
+        """Register suspended tail s of a new cell"""
+        self._created += 1
+        self._refs.add(weakref.ref(s, self._release))
+
+    def _release(self, ref):
+        self._released += 1
+        self._refs.discard(ref)
+
+    @property
+    def created(self):
+        """Number of cells created"""
+        return self._created
+
+    @property
+    def retained(self):
+        """Number of cells still alive"""
+        return self._created - self._released
+
+    def __repr__(self):
+        return "<RetentionMonitor: {} cells retained of {} created>".format(self.retained, self.created)
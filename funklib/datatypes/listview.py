@@ -54,3 +54,68 @@ class SeqView(Sequence):
             )
         )
 
+
+
+class ListSlice(Sequence):
+    """
+    Readonly view of a slice of a linked list, sharing its cells: 
+    every `step` elements among the first `count` elements(all if count is None) 
+    of the list starting at cell `cells`.
+    """
+    __slots__ = ["_cls", "_cells", "_count", "_step", "_length"]
+
+    def __init__(self, cells, count=None, step=1, cls=None):
+        self._cls = cls or type(cells)
+        self._cells = cells
+        self._count = count
+        self._step = step
+        self._length = None
+
+    @property
+    def cells(self):
+        return self._cells
+
+    def __iter__(self):
+        return islice(self._cells, 0, self._count, self._step)
+
+    def __len__(self):
+        if self._length is None:
+            if self._count is None:
+                n = len(self._cells)
+            elif hasattr(self._cells, "size"):
+                n = min(self._count, self._cells.size)
+            else:
+                n = sum(1 for _ in islice(self._cells, self._count))
+            self._length = (n + self._step - 1) // self._step
+        return self._length
+
+    def _drop(self, n):
+        return self._cells if n == 0 or self._cells.is_empty() else self._cells.drop(n)
+
+    def __getitem__(self, index):
+        if type(index) is slice:
+            r = range(len(self))[index]
+            if r.step < 0:
+                return self._cls.from_iterable(tuple(self)[index])
+            elif len(r) == 0:
+                return ListSlice(self._cells, 0, 1, self._cls)
+            else:
+                step = r.step*self._step
+                return ListSlice(self._drop(r.start*self._step), (len(r) - 1)*step + 1, step, self._cls)
+        else:
+            if index < 0:
+                index += len(self)
+            i = index*self._step
+            if index < 0 or (self._count is not None and i >= self._count):
+                raise IndexError("ListSlice index out of range")
+            x = self._drop(i)
+            if x.is_empty():
+                raise IndexError("ListSlice index out of range")
+            return x.head
+
+    def to_list(self):
+        """Copy of the slice as a list of the type of the source list"""
+        return self._cls.from_iterable(self)
+
+    def __repr__(self):
+        return "ListSlice({})".format(", ".join(map(str, self)))
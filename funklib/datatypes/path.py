@@ -1,5 +1,5 @@
 from operator import methodcaller, attrgetter, itemgetter
-from functools import partial
+from functools import partial, lru_cache
 from funklib.basics import flatmap
 from collections.abc import Sequence, Mapping
 import abc
@@ -33,17 +33,44 @@ class Path(abc.ABC):
         pass
 
     
+def component_index(c):
+    """Integer value of a pointer component, used to index sequences, or None if it is not an integer"""
+    try:
+        return int(c)
+    except ValueError:
+        return None
+
+
+_missing = object()
+
+
 @Path.register
 class JSONPath(tuple):
+    """
+    JSON pointer(RFC 6901) as a tuple of components.
+    Steps dispatch on the exact type of plain dicts and lists first,
+    falling back to the Sequence/Mapping ABCs for other types.
+    """
     def __new__(cls, *components):
-        return tuple.__new__(cls, components)
+        self = tuple.__new__(cls, components)
+        # components paired with their integer value, computed once for list indexing
+        self._steps = tuple((c, component_index(c)) for c in components)
+        return self
+
+    def __getnewargs__(self):
+        return tuple(self)
 
     def get(self, obj, default=None):
         t = obj
-        for c in self:
-            if isinstance(t, Sequence):
+        for c, i in self._steps:
+            tt = type(t)
+            if tt is dict:
+                t = t.get(c, _missing)
+                if t is _missing:
+                    return default
+            elif tt is list or isinstance(t, Sequence):
                 try:
-                    t = t[int(c)]
+                    t = t[int(c) if i is None else i]
                 except IndexError:
                     return default
             elif isinstance(t, Mapping):
@@ -58,30 +85,46 @@ class JSONPath(tuple):
         else:
             return t
 
+    def get_many(self, docs, default=None):
+        """Evaluate the path over each of docs, returning the list of values"""
+        get = self.get
+        return [get(doc, default) for doc in docs]
+
     def set(self, obj, value):
         t = obj
-        for c in self[:-1]:
-            if isinstance(t, Sequence):
-                t = t[int(c)]
+        for c, i in self._steps[:-1]:
+            tt = type(t)
+            if tt is dict:
+                t = t[c]
+            elif tt is list or isinstance(t, Sequence):
+                t = t[int(c) if i is None else i]
             elif isinstance(t, Mapping):
                 t = t[c]
             else:
                 raise TypeError("Pointer component {!r} cannot be followed through object {!r} of type {!r}".format(
                     c, t, type(t).__name__
                 ))
-        else:            
-            if isinstance(t, Sequence):
-                t[int(self[-1])] = value
+        else:
+            c, i = self._steps[-1]
+            tt = type(t)
+            if tt is dict:
+                t[c] = value
+            elif tt is list or isinstance(t, Sequence):
+                t[int(c) if i is None else i] = value
             elif isinstance(t, Mapping):
-                t[self[-1]] = value
+                t[c] = value
             else:
                 raise TypeError("Pointer component {!r} cannot be followed through object {!r} of type {!r}".format(
-                    self[-1], t, type(t).__name__
+                    c, t, type(t).__name__
                 ))
-                
-    
+
     @classmethod
+    @lru_cache(maxsize=4096)
     def from_string(cls, path):
+        """
+        Parse a JSON pointer string.
+        Parsed paths are interned in a bounded cache, so parsing the same string again returns the same path.
+        """
         if len(path) == 0:
             return cls()
         elif path[0] == "/":
@@ -124,3 +167,132 @@ class AttrPath(tuple):
             cs = path[1:].split(".")
             return cls(*cs)
     
+
+
+def json_step(t, c, i):
+    """Follow the JSON pointer component c(with integer value i) through t, returning `_missing` if absent"""
+    tt = type(t)
+    if tt is dict:
+        return t.get(c, _missing)
+    elif tt is list or isinstance(t, Sequence):
+        try:
+            return t[int(c) if i is None else i]
+        except IndexError:
+            return _missing
+    elif isinstance(t, Mapping):
+        try:
+            return t[c]
+        except KeyError:
+            return _missing
+    else:
+        raise TypeError("Pointer component {!r} cannot be followed through object {!r} of type {!r}".format(
+            c, t, type(t).__name__
+        ))
+
+
+def attr_step(t, c, i):
+    """Follow the attribute c through t, returning `_missing` if absent"""
+    return getattr(t, c, _missing)
+
+
+class PathTrie:
+    """Node of a prefix trie of paths, with the output slots of the paths ending at it"""
+    __slots__ = ("slots", "children")
+
+    def __init__(self):
+        self.slots = []
+        self.children = {}
+
+    def insert(self, steps, slot):
+        node = self
+        for key in steps:
+            node = node.children.setdefault(key, PathTrie())
+        node.slots.append(slot)
+
+    def compile(self, t, namespace, depth=1):
+        """
+        Lines of code assigning the values of the paths ending in this trie
+        from the value of the variable `t`, following each child step once.
+        Names used by the code are added to `namespace`.
+        """
+        indent = "    " * depth
+        lines = ["{}v{} = {}".format(indent, slot, t) for slot in self.slots]
+        for n, ((step, c, i), child) in enumerate(self.children.items()):
+            tc = "{}_{}".format(t, n)
+            key = "_c{}".format(len(namespace))
+            namespace[key] = c
+            if step is json_step:
+                # plain dicts are followed inline, other types through the generic step
+                lines.append("{ind}{tc} = {t}.get({k}, _missing) if type({t}) is dict else _json_step({t}, {k}, {i})".format(
+                    ind=indent, tc=tc, t=t, k=key, i=i
+                ))
+            else:
+                lines.append("{}{} = _getattr({}, {}, _missing)".format(indent, tc, t, key))
+            lines.append("{}if {} is not _missing:".format(indent, tc))
+            lines.extend(child.compile(tc, namespace, depth + 1))
+        return lines
+
+
+_path_set_template = """\
+def extract(t):
+    {values} = _default
+{body}
+    return {result}
+"""
+
+
+def compile_path_set(trie, n, names, default):
+    """Generate a function extracting the values of the n paths in trie from an object, in one traversal"""
+    namespace = {
+        "_missing": _missing, "_json_step": json_step, "_getattr": getattr, "_default": default
+    }
+    values = ["v{}".format(i) for i in range(n)]
+    if names is None:
+        result = "({},)".format(", ".join(values)) if n else "()"
+    else:
+        namespace.update(("_n{}".format(i), name) for i, name in enumerate(names))
+        result = "{{{}}}".format(", ".join("_n{}: v{}".format(i, i) for i in range(n)))
+    body = "\n".join(trie.compile("t", namespace)) or "    pass"
+    exec(_path_set_template.format(values=" = ".join(values + ["_"]), body=body, result=result), namespace)
+    return namespace["extract"]
+
+
+class PathSet:
+    """
+    Set of paths(JSONPath or AttrPath) extracted together from objects,
+    compiled into a prefix trie so that shared prefixes are followed once per object.
+    The trie is compiled to a generated function, following it in a single pass.
+    Given a mapping of names to paths, extraction returns a dict of the values by name,
+    and given an iterable of paths, a tuple of the values in order.
+    Values of paths which cannot be followed are `default`.
+    """
+    def __init__(self, paths, default=None):
+        if isinstance(paths, Mapping):
+            self.names = tuple(paths)
+            paths = tuple(paths.values())
+        else:
+            self.names = None
+            paths = tuple(paths)
+        self.paths = paths
+        self.default = default
+        trie = PathTrie()
+        for slot, path in enumerate(paths):
+            if isinstance(path, JSONPath):
+                steps = tuple((json_step, c, i) for c, i in path._steps)
+            elif isinstance(path, AttrPath):
+                steps = tuple((attr_step, c, None) for c in path)
+            else:
+                raise TypeError("Expected a JSONPath or AttrPath, got {!r}".format(path))
+            trie.insert(steps, slot)
+        self.extract = compile_path_set(trie, len(paths), self.names, default)
+
+    def extract(self, obj):
+        """Extract the values of the paths from obj"""
+        return self.extract(obj)
+
+    def __call__(self, obj):
+        return self.extract(obj)
+
+    def extract_many(self, docs):
+        """Extract the values of the paths from each of docs"""
+        return list(map(self.extract, docs))
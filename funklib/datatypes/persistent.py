@@ -0,0 +1,773 @@
+"""
+Persistent vector and hash map/set datatypes, with structural sharing.
+
+`PersistentVector` is a 32-way trie with a tail buffer,
+giving near-constant time indexing, update and append.
+`PersistentMap` and `PersistentSet` are hash array mapped tries(HAMT),
+giving near-constant time lookup, insertion and removal.
+
+Updating operations return new instances, sharing all unchanged nodes with the original.
+For bulk construction, `transient` returns a mutable builder which mutates
+the nodes it created itself in place, and is turned back into a persistent value
+with `persistent`.
+"""
+import typing
+from collections.abc import Sequence, Mapping, Set, ItemsView, ValuesView
+from funklib.datatypes.abc import Functor, Monad, Filterable, default_flatten
+
+
+A = typing.TypeVar("A")
+K = typing.TypeVar("K")
+V = typing.TypeVar("V")
+
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+
+_missing = object()
+
+
+class Node:
+    """Trie node, owned by the transient which created it, if any"""
+    __slots__ = ("edit", "array")
+
+    def __init__(self, edit, array):
+        self.edit = edit
+        self.array = array
+
+
+def editable(edit, node):
+    """Returns node if it is owned by edit, or an owned copy of it"""
+    if edit is not None and node.edit is edit:
+        return node
+    return Node(edit, list(node.array))
+
+
+EMPTY_NODE = Node(None, [])
+
+
+## Vector
+
+def tail_offset(count):
+    return 0 if count < WIDTH else ((count - 1) >> BITS) << BITS
+
+
+def new_path(edit, level, node):
+    while level > 0:
+        node = Node(edit, [node])
+        level -= BITS
+    return node
+
+
+def push_tail(edit, count, level, parent, tail_node):
+    node = editable(edit, parent)
+    subidx = ((count - 1) >> level) & MASK
+    if level == BITS:
+        child = tail_node
+    elif subidx < len(node.array):
+        child = push_tail(edit, count, level - BITS, node.array[subidx], tail_node)
+    else:
+        child = new_path(edit, level - BITS, tail_node)
+    if subidx < len(node.array):
+        node.array[subidx] = child
+    else:
+        node.array.append(child)
+    return node
+
+
+def pop_tail(edit, count, level, node):
+    subidx = ((count - 2) >> level) & MASK
+    if level > BITS:
+        child = pop_tail(edit, count, level - BITS, node.array[subidx])
+        if child is None and subidx == 0:
+            return None
+        node = editable(edit, node)
+        if child is None:
+            del node.array[subidx:]
+        else:
+            node.array[subidx] = child
+        return node
+    elif subidx == 0:
+        return None
+    else:
+        node = editable(edit, node)
+        del node.array[subidx:]
+        return node
+
+
+def do_assoc(edit, level, node, i, x):
+    node = editable(edit, node)
+    if level == 0:
+        node.array[i & MASK] = x
+    else:
+        subidx = (i >> level) & MASK
+        node.array[subidx] = do_assoc(edit, level - BITS, node.array[subidx], i, x)
+    return node
+
+
+class VectorBase:
+    __slots__ = ()
+
+    def _leaf(self, i):
+        if i >= tail_offset(self._count):
+            return self._tail
+        node = self._root
+        level = self._shift
+        while level > 0:
+            node = node.array[(i >> level) & MASK]
+            level -= BITS
+        return node.array
+
+    def _index(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Vector index out of range")
+        return index
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PersistentVector.from_iterable(self[i] for i in range(*index.indices(self._count)))
+        count = self._count
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("Vector index out of range")
+        return self._leaf(index)[index & MASK]
+
+    def chunks(self):
+        """Iterate over the leaf arrays of the vector"""
+        for i in range(0, tail_offset(self._count), WIDTH):
+            yield self._leaf(i)
+        yield self._tail
+
+    def __iter__(self):
+        for chunk in self.chunks():
+            yield from chunk
+
+
+class PersistentVector(VectorBase, Monad[A], Sequence, Filterable[A]):
+    """Persistent vector, as a 32-way trie with tail optimisation"""
+    __slots__ = ("_count", "_shift", "_root", "_tail", "_hash")
+
+    def __new__(cls, *elements):
+        return cls.from_iterable(elements)
+
+    @classmethod
+    def _make(cls, count, shift, root, tail):
+        self = object.__new__(cls)
+        self._count = count
+        self._shift = shift
+        self._root = root
+        self._tail = tail
+        self._hash = None
+        return self
+
+    @classmethod
+    def from_iterable(cls, iterable):
+        if isinstance(iterable, cls):
+            return iterable
+        t = cls.Empty.transient()
+        t.extend(iterable)
+        return t.persistent()
+
+    def transient(self):
+        """Mutable builder starting from this vector"""
+        return TransientVector(self)
+
+    def append(self, x):
+        """Returns a new vector with x added at the end"""
+        count, shift, root = self._count, self._shift, self._root
+        if count - tail_offset(count) < WIDTH:
+            return self._make(count + 1, shift, root, self._tail + [x])
+        tail_node = Node(None, self._tail)
+        if (count >> BITS) > (1 << shift):
+            root = Node(None, [root, new_path(None, shift, tail_node)])
+            shift += BITS
+        else:
+            root = push_tail(None, count, shift, root, tail_node)
+        return self._make(count + 1, shift, root, [x])
+
+    def extend(self, iterable):
+        """Returns a new vector with the elements of iterable added at the end"""
+        t = self.transient()
+        t.extend(iterable)
+        return t.persistent()
+
+    def set(self, index, x):
+        """Returns a new vector with the element at index replaced by x"""
+        index = self._index(index)
+        if index >= tail_offset(self._count):
+            tail = list(self._tail)
+            tail[index & MASK] = x
+            return self._make(self._count, self._shift, self._root, tail)
+        return self._make(self._count, self._shift, do_assoc(None, self._shift, self._root, index, x), self._tail)
+
+    def pop(self):
+        """Returns a new vector without its last element"""
+        count, shift = self._count, self._shift
+        if count == 0:
+            raise IndexError("Can't pop from empty vector")
+        elif count == 1:
+            return type(self).Empty
+        elif count - tail_offset(count) > 1:
+            return self._make(count - 1, shift, self._root, self._tail[:-1])
+        tail = self._leaf(count - 2)
+        root = pop_tail(None, count, shift, self._root) or EMPTY_NODE
+        if shift > BITS and len(root.array) == 1:
+            root = root.array[0]
+            shift -= BITS
+        return self._make(count - 1, shift, root, tail)
+
+    def __add__(self, other):
+        return self.extend(other)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        elif isinstance(other, VectorBase):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        else:
+            return NotImplemented
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(tuple(self))
+        return self._hash
+
+    def __repr__(self):
+        return "PersistentVector([{}])".format(", ".join(map(repr, self)))
+
+    def __reduce__(self):
+        return (type(self).from_iterable, (list(self),))
+
+    @classmethod
+    def pure(cls, x):
+        return cls(x)
+
+    def map(self, f):
+        return type(self).from_iterable(map(f, self))
+
+    def filter(self, f):
+        return type(self).from_iterable(filter(f, self))
+
+    def apply(self, other):
+        return type(self).from_iterable(f(x) for f in self for x in other)
+
+    def then(self, f):
+        t = type(self).Empty.transient()
+        for x in self:
+            t.extend(f(x))
+        return t.persistent()
+
+    flatten = default_flatten
+
+
+PersistentVector.Empty = PersistentVector._make(0, BITS, EMPTY_NODE, [])
+
+
+class TransientVector(VectorBase):
+    """Mutable builder for persistent vectors"""
+    __slots__ = ("_count", "_shift", "_root", "_tail", "_edit")
+
+    def __init__(self, vector):
+        self._edit = edit = object()
+        self._count = vector._count
+        self._shift = vector._shift
+        self._root = Node(edit, list(vector._root.array))
+        self._tail = list(vector._tail)
+
+    def _ensure_editable(self):
+        if self._edit is None:
+            raise TypeError("Transient used after call to persistent")
+        return self._edit
+
+    def append(self, x):
+        edit = self._ensure_editable()
+        count = self._count
+        if count - tail_offset(count) < WIDTH:
+            self._tail.append(x)
+        else:
+            tail_node = Node(edit, self._tail)
+            if (count >> BITS) > (1 << self._shift):
+                self._root = Node(edit, [self._root, new_path(edit, self._shift, tail_node)])
+                self._shift += BITS
+            else:
+                self._root = push_tail(edit, count, self._shift, self._root, tail_node)
+            self._tail = [x]
+        self._count = count + 1
+        return self
+
+    def extend(self, iterable):
+        append = self.append
+        for x in iterable:
+            append(x)
+        return self
+
+    def __setitem__(self, index, x):
+        edit = self._ensure_editable()
+        index = self._index(index)
+        if index >= tail_offset(self._count):
+            self._tail[index & MASK] = x
+        else:
+            self._root = do_assoc(edit, self._shift, self._root, index, x)
+
+    def pop(self):
+        edit = self._ensure_editable()
+        count = self._count
+        if count == 0:
+            raise IndexError("Can't pop from empty vector")
+        x = self[count - 1]
+        if count == 1 or count - tail_offset(count) > 1:
+            self._tail.pop()
+        else:
+            self._tail = list(self._leaf(count - 2))
+            root = pop_tail(edit, count, self._shift, self._root) or Node(edit, [])
+            if self._shift > BITS and len(root.array) == 1:
+                root = root.array[0]
+                self._shift -= BITS
+            self._root = root
+        self._count = count - 1
+        return x
+
+    def persistent(self):
+        """Returns a persistent vector, invalidating the transient"""
+        self._ensure_editable()
+        self._edit = None
+        return PersistentVector._make(self._count, self._shift, self._root, self._tail)
+
+    def __repr__(self):
+        return "TransientVector([{}])".format(", ".join(map(repr, self)))
+
+
+## Hash array mapped trie
+
+def hash32(key):
+    return hash(key) & 0xFFFFFFFF
+
+
+def bitcount(x):
+    return bin(x).count("1")
+
+
+class BitmapNode(Node):
+    """HAMT node, with entries which are either (key, value) pairs or child nodes,
+    indexed by a bitmap of the 5-bit hash slices present"""
+    __slots__ = ("bitmap",)
+
+    def __init__(self, edit, bitmap, array):
+        super().__init__(edit, array)
+        self.bitmap = bitmap
+
+    def editable(self, edit):
+        if edit is not None and self.edit is edit:
+            return self
+        return BitmapNode(edit, self.bitmap, list(self.array))
+
+    def find(self, shift, h, key, default):
+        bit = 1 << ((h >> shift) & MASK)
+        if not self.bitmap & bit:
+            return default
+        entry = self.array[bitcount(self.bitmap & (bit - 1))]
+        if isinstance(entry, Node):
+            return entry.find(shift + BITS, h, key, default)
+        elif entry[0] is key or entry[0] == key:
+            return entry[1]
+        else:
+            return default
+
+    def assoc(self, edit, shift, h, key, value, added):
+        bit = 1 << ((h >> shift) & MASK)
+        idx = bitcount(self.bitmap & (bit - 1))
+        if not self.bitmap & bit:
+            added.append(True)
+            node = self.editable(edit)
+            node.array.insert(idx, (key, value))
+            node.bitmap |= bit
+            return node
+        entry = self.array[idx]
+        if isinstance(entry, Node):
+            child = entry.assoc(edit, shift + BITS, h, key, value, added)
+            if child is entry:
+                return self
+        elif entry[0] is key or entry[0] == key:
+            if entry[1] is value:
+                return self
+            child = (entry[0], value)
+        else:
+            added.append(True)
+            child = create_node(edit, shift + BITS, entry, h, key, value)
+        node = self.editable(edit)
+        node.array[idx] = child
+        return node
+
+    def without(self, edit, shift, h, key, removed):
+        bit = 1 << ((h >> shift) & MASK)
+        if not self.bitmap & bit:
+            return self
+        idx = bitcount(self.bitmap & (bit - 1))
+        entry = self.array[idx]
+        if isinstance(entry, Node):
+            child = entry.without(edit, shift + BITS, h, key, removed)
+            if not removed:
+                return self
+            elif child is not None:
+                node = self.editable(edit)
+                node.array[idx] = child
+                return node
+        elif not (entry[0] is key or entry[0] == key):
+            return self
+        else:
+            removed.append(True)
+        if self.bitmap == bit:
+            return None
+        node = self.editable(edit)
+        del node.array[idx]
+        node.bitmap ^= bit
+        return node
+
+    def items(self):
+        for entry in self.array:
+            if isinstance(entry, Node):
+                yield from entry.items()
+            else:
+                yield entry
+
+
+class CollisionNode(Node):
+    """HAMT leaf node for keys with identical hashes"""
+    __slots__ = ("hash",)
+
+    def __init__(self, edit, h, array):
+        super().__init__(edit, array)
+        self.hash = h
+
+    def editable(self, edit):
+        if edit is not None and self.edit is edit:
+            return self
+        return CollisionNode(edit, self.hash, list(self.array))
+
+    def _position(self, key):
+        for i, (k, v) in enumerate(self.array):
+            if k is key or k == key:
+                return i
+        return -1
+
+    def find(self, shift, h, key, default):
+        i = self._position(key)
+        return default if i < 0 else self.array[i][1]
+
+    def assoc(self, edit, shift, h, key, value, added):
+        if h != self.hash:
+            bitmap = 1 << ((self.hash >> shift) & MASK)
+            return BitmapNode(edit, bitmap, [self]).assoc(edit, shift, h, key, value, added)
+        i = self._position(key)
+        if i >= 0 and self.array[i][1] is value:
+            return self
+        node = self.editable(edit)
+        if i < 0:
+            added.append(True)
+            node.array.append((key, value))
+        else:
+            node.array[i] = (node.array[i][0], value)
+        return node
+
+    def without(self, edit, shift, h, key, removed):
+        i = self._position(key)
+        if i < 0:
+            return self
+        removed.append(True)
+        if len(self.array) == 1:
+            return None
+        node = self.editable(edit)
+        del node.array[i]
+        return node
+
+    def items(self):
+        return iter(self.array)
+
+
+def create_node(edit, shift, entry, h, key, value):
+    h1 = hash32(entry[0])
+    if h1 == h:
+        return CollisionNode(edit, h, [entry, (key, value)])
+    added = []
+    return BitmapNode(edit, 0, [])\
+        .assoc(edit, shift, h1, entry[0], entry[1], added)\
+        .assoc(edit, shift, h, key, value, added)
+
+
+EMPTY_BITMAP_NODE = BitmapNode(None, 0, [])
+
+
+class MapItemsView(ItemsView):
+    def __iter__(self):
+        return self._mapping._root.items()
+
+
+class MapValuesView(ValuesView):
+    def __iter__(self):
+        for k, v in self._mapping._root.items():
+            yield v
+
+
+class MapBase:
+    __slots__ = ()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, key):
+        value = self._root.find(0, hash32(key), key, _missing)
+        if value is _missing:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        return self._root.find(0, hash32(key), key, default)
+
+    def __contains__(self, key):
+        return self._root.find(0, hash32(key), key, _missing) is not _missing
+
+    def __iter__(self):
+        for k, v in self._root.items():
+            yield k
+
+    def items(self):
+        return MapItemsView(self)
+
+    def values(self):
+        return MapValuesView(self)
+
+
+class PersistentMap(MapBase, Functor[V], Mapping, Filterable[V]):
+    """Persistent hash map, as a hash array mapped trie"""
+    __slots__ = ("_count", "_root", "_hash")
+
+    def __new__(cls, *args, **kwargs):
+        return cls.Empty.update(*args, **kwargs)
+
+    @classmethod
+    def _make(cls, count, root):
+        self = object.__new__(cls)
+        self._count = count
+        self._root = root
+        self._hash = None
+        return self
+
+    @classmethod
+    def from_iterable(cls, iterable):
+        """Map from an iterable of (key, value) pairs"""
+        return cls.Empty.update(iterable)
+
+    def transient(self):
+        """Mutable builder starting from this map"""
+        return TransientMap(self)
+
+    def set(self, key, value):
+        """Returns a new map associating key with value"""
+        added = []
+        root = self._root.assoc(None, 0, hash32(key), key, value, added)
+        return self if root is self._root else self._make(self._count + len(added), root)
+
+    def discard(self, key):
+        """Returns a new map without key"""
+        removed = []
+        root = self._root.without(None, 0, hash32(key), key, removed)
+        if not removed:
+            return self
+        return self._make(self._count - 1, root or EMPTY_BITMAP_NODE)
+
+    def remove(self, key):
+        """Returns a new map without key,
+        raising KeyError if it is missing"""
+        new = self.discard(key)
+        if new is self:
+            raise KeyError(key)
+        return new
+
+    def update(self, *args, **kwargs):
+        """Returns a new map with the associations from
+        a mapping or iterable of pairs, and keyword arguments"""
+        t = self.transient()
+        t.update(*args, **kwargs)
+        return t.persistent()
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(frozenset(self.items()))
+        return self._hash
+
+    def __repr__(self):
+        return "PersistentMap({{{}}})".format(", ".join("{!r}: {!r}".format(k, v) for k, v in self.items()))
+
+    def __reduce__(self):
+        return (type(self).from_iterable, (list(self.items()),))
+
+    def map(self, f):
+        """Map a function over the values"""
+        return type(self).from_iterable((k, f(v)) for k, v in self.items())
+
+    def filter(self, f):
+        """Keep the entries for which the value satisfies the predicate"""
+        return type(self).from_iterable((k, v) for k, v in self.items() if f(v))
+
+
+PersistentMap.Empty = PersistentMap._make(0, EMPTY_BITMAP_NODE)
+
+
+class TransientMap(MapBase):
+    """Mutable builder for persistent maps"""
+    __slots__ = ("_count", "_root", "_edit")
+
+    def __init__(self, m):
+        self._edit = object()
+        self._count = m._count
+        self._root = m._root
+
+    def _ensure_editable(self):
+        if self._edit is None:
+            raise TypeError("Transient used after call to persistent")
+        return self._edit
+
+    def __setitem__(self, key, value):
+        added = []
+        self._root = self._root.assoc(self._ensure_editable(), 0, hash32(key), key, value, added)
+        self._count += len(added)
+
+    def __delitem__(self, key):
+        removed = []
+        root = self._root.without(self._ensure_editable(), 0, hash32(key), key, removed)
+        if not removed:
+            raise KeyError(key)
+        self._root = root or EMPTY_BITMAP_NODE
+        self._count -= 1
+
+    def update(self, *args, **kwargs):
+        if args:
+            (other,) = args
+            pairs = other.items() if isinstance(other, Mapping) else other
+            for k, v in pairs:
+                self[k] = v
+        for k, v in kwargs.items():
+            self[k] = v
+
+    def persistent(self):
+        """Returns a persistent map, invalidating the transient"""
+        self._ensure_editable()
+        self._edit = None
+        return PersistentMap._make(self._count, self._root)
+
+    def __repr__(self):
+        return "TransientMap({{{}}})".format(", ".join("{!r}: {!r}".format(k, v) for k, v in self._root.items()))
+
+
+class PersistentSet(Functor[A], Set, Filterable[A]):
+    """Persistent hash set, as a hash array mapped trie"""
+    __slots__ = ("_map",)
+
+    def __new__(cls, iterable=()):
+        return cls.from_iterable(iterable)
+
+    @classmethod
+    def _make(cls, m):
+        self = object.__new__(cls)
+        self._map = m
+        return self
+
+    @classmethod
+    def from_iterable(cls, iterable):
+        if isinstance(iterable, cls):
+            return iterable
+        t = cls.Empty.transient()
+        t.update(iterable)
+        return t.persistent()
+
+    _from_iterable = from_iterable
+
+    def transient(self):
+        """Mutable builder starting from this set"""
+        return TransientSet(self)
+
+    def __len__(self):
+        return len(self._map)
+
+    def __contains__(self, x):
+        return x in self._map
+
+    def __iter__(self):
+        return iter(self._map)
+
+    def add(self, x):
+        """Returns a new set including x"""
+        m = self._map.set(x, None)
+        return self if m is self._map else self._make(m)
+
+    def discard(self, x):
+        """Returns a new set without x"""
+        m = self._map.discard(x)
+        return self if m is self._map else self._make(m)
+
+    def remove(self, x):
+        """Returns a new set without x,
+        raising KeyError if it is missing"""
+        return self._make(self._map.remove(x))
+
+    def update(self, iterable):
+        t = self.transient()
+        t.update(iterable)
+        return t.persistent()
+
+    __hash__ = Set._hash
+
+    def __repr__(self):
+        return "PersistentSet({{{}}})".format(", ".join(map(repr, self)))
+
+    def __reduce__(self):
+        return (type(self).from_iterable, (list(self),))
+
+    def map(self, f):
+        return type(self).from_iterable(map(f, self))
+
+    def filter(self, f):
+        return type(self).from_iterable(filter(f, self))
+
+
+PersistentSet.Empty = PersistentSet._make(PersistentMap.Empty)
+
+
+class TransientSet:
+    """Mutable builder for persistent sets"""
+    __slots__ = ("_map",)
+
+    def __init__(self, s):
+        self._map = s._map.transient()
+
+    def __len__(self):
+        return len(self._map)
+
+    def __contains__(self, x):
+        return x in self._map
+
+    def __iter__(self):
+        return iter(self._map)
+
+    def add(self, x):
+        self._map[x] = None
+
+    def discard(self, x):
+        try:
+            del self._map[x]
+        except KeyError:
+            pass
+
+    def update(self, iterable):
+        for x in iterable:
+            self._map[x] = None
+
+    def persistent(self):
+        """Returns a persistent set, invalidating the transient"""
+        return PersistentSet._make(self._map.persistent())
@@ -0,0 +1,216 @@
+"""
+Persistent random-access list, implemented as a skew-binary random-access list(Okasaki).
+
+The list is a sequence of complete binary trees of strictly increasing sizes
+(except possibly the first two), each of size 2^k-1, stored in preorder.
+This gives constant time `prepend`, `head` and `tail`, like a linked list,
+and logarithmic time indexing, update and `drop`.
+
+Trees are plain tuples: `(x,)` for a leaf and `(x, left, right)` for a node.
+The sequence of trees is a chain of tuples `(weight, tree, rest)` ending in None.
+"""
+import functools as ft
+import itertools as it
+from .adt import data
+from .functionals import Monad
+
+
+def tree_lookup(weight, tree, i):
+    while i > 0:
+        weight //= 2
+        if i <= weight:
+            tree = tree[1]
+            i -= 1
+        else:
+            tree = tree[2]
+            i -= 1 + weight
+    return tree[0]
+
+
+def tree_update(weight, tree, i, x):
+    path = []
+    while i > 0:
+        weight //= 2
+        if i <= weight:
+            path.append((tree, True))
+            tree = tree[1]
+            i -= 1
+        else:
+            path.append((tree, False))
+            tree = tree[2]
+            i -= 1 + weight
+    new = (x,) + tree[1:]
+    for parent, left in reversed(path):
+        new = (parent[0], new, parent[2]) if left else (parent[0], parent[1], new)
+    return new
+
+
+def tree_iter(tree):
+    stack = [tree]
+    while stack:
+        t = stack.pop()
+        yield t[0]
+        if len(t) > 1:
+            stack.append(t[2])
+            stack.append(t[1])
+
+
+@Monad.register
+class RandomAccessList(data):
+    """Persistent list with the `List` interface,
+    and logarithmic time indexing"""
+    _fields = ("size", "trees")
+
+    def __new__(cls, *elements):
+        return cls.from_iterable(elements)
+
+    @classmethod
+    def _make(cls, size, trees):
+        return tuple.__new__(cls, (size, trees))
+
+    @classmethod
+    def from_iterable(cls, iterable):
+        if isinstance(iterable, cls):
+            return iterable
+        return ft.reduce(cls.prepend, reversed(tuple(iterable)), cls.Empty)
+
+    @property
+    def head(self):
+        if self.size == 0:
+            raise AttributeError("Empty list has no head")
+        return self.trees[1][0]
+
+    @property
+    def tail(self):
+        if self.size == 0:
+            raise AttributeError("Empty list has no tail")
+        weight, tree, rest = self.trees
+        if weight > 1:
+            weight //= 2
+            rest = (weight, tree[1], (weight, tree[2], rest))
+        return self._make(self.size - 1, rest)
+
+    def is_empty(self):
+        return self.size == 0
+
+    def prepend(self, x):
+        trees = self.trees
+        if trees is not None and trees[2] is not None and trees[0] == trees[2][0]:
+            weight, left, (_, right, rest) = trees
+            return self._make(self.size + 1, (2 * weight + 1, (x, left, right), rest))
+        else:
+            return self._make(self.size + 1, (1, (x,), trees))
+
+    @classmethod
+    def cons(cls, a, b):
+        return b.prepend(a)
+
+    def uncons(self):
+        return self.head, self.tail
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        trees = self.trees
+        while trees is not None:
+            yield from tree_iter(trees[1])
+            trees = trees[2]
+
+    def __reversed__(self):
+        return reversed(tuple(self))
+
+    def inits(self):
+        x = self
+        while not x.is_empty():
+            yield x
+            x = x.tail
+        yield x
+
+    def _index(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("List index out of bounds")
+        return index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.size)
+            if step == 1:
+                return self.drop(start).take(max(stop - start, 0))
+            else:
+                return type(self).from_iterable(self[i] for i in range(start, stop, step))
+        index = self._index(index)
+        trees = self.trees
+        while index >= trees[0]:
+            index -= trees[0]
+            trees = trees[2]
+        return tree_lookup(trees[0], trees[1], index)
+
+    def update(self, index, x):
+        """Returns a new list with the element at `index` replaced by x"""
+        index = self._index(index)
+        skipped = []
+        trees = self.trees
+        while index >= trees[0]:
+            index -= trees[0]
+            skipped.append(trees)
+            trees = trees[2]
+        new = (trees[0], tree_update(trees[0], trees[1], index, x), trees[2])
+        for weight, tree, _ in reversed(skipped):
+            new = (weight, tree, new)
+        return self._make(self.size, new)
+
+    def drop(self, n):
+        if n <= 0:
+            return self
+        if n >= self.size:
+            return type(self).Empty
+        size = self.size - n
+        trees = self.trees
+        while n >= trees[0]:
+            n -= trees[0]
+            trees = trees[2]
+        weight, tree, rest = trees
+        while n > 0:
+            weight //= 2
+            if n <= weight:
+                rest = (weight, tree[2], rest)
+                tree = tree[1]
+                n -= 1
+            else:
+                tree = tree[2]
+                n -= 1 + weight
+        return self._make(size, (weight, tree, rest))
+
+    def take(self, n):
+        if n <= 0:
+            return type(self).Empty
+        return self if n >= self.size else type(self).from_iterable(it.islice(self, n))
+
+    def __add__(self, other):
+        return ft.reduce(type(self).prepend, reversed(self), type(self).from_iterable(other))
+
+    def __repr__(self):
+        return "RandomAccessList({})".format(", ".join(map(str, self)))
+
+    @classmethod
+    def pure(cls, x):
+        return cls(x)
+
+    @classmethod
+    def fail(cls, e):
+        return cls.Empty
+
+    def then(self, f):
+        return type(self).from_iterable(it.chain.from_iterable(map(f, self)))
+
+    def fmap(self, f):
+        return type(self).from_iterable(map(f, self))
+
+    def ap(self, other):
+        return type(self).from_iterable(f(x) for f in self for x in other)
+
+
+RandomAccessList.Empty = RandomAccessList._make(0, None)
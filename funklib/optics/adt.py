@@ -0,0 +1,185 @@
+"""
+Optics derived from the fields of ADT classes(tuple subclasses declaring `_fields`, such as `data` classes).
+
+Field lenses and constructor prisms are generated code specialised for their class:
+instances are read by index and rebuilt with `tuple.__new__` directly,
+without going through the keyword-argument constructor of the class.
+Instances rebuilt this way bypass the cache or interning of their constructor, if any.
+"""
+import typing
+import types
+import functools as ft
+from operator import attrgetter
+from keyword import iskeyword
+from funklib.optics.lens import Lens, bind
+from funklib.optics.prism import Prism, NoMatch
+from funklib.datatypes.option import Some, Nothing
+
+
+S = typing.TypeVar("S")
+A = typing.TypeVar("A")
+
+
+def plain_indexing(cls):
+    """
+    True if instances of cls can be indexed and sliced as plain tuples.
+    Instances of subclasses may still override indexing, so generated code checks the exact type first.
+    """
+    return cls.__getitem__ is tuple.__getitem__
+
+
+class FieldLens(Lens[S, A]):
+    """
+    Lens on a field of an ADT class.
+    Updates keep the type of the whole, including subclasses with more fields.
+    Use `field_lens` to get the shared instance for a field.
+    """
+    def __init__(self, cls, field: str):
+        self.cls = cls
+        self.field = field
+        self.index = cls._fields.index(field)
+        namespace = {}
+        exec(_field_lens_template.format(
+            focus=self.compile_get("s", namespace),
+            updated=self.compile_set("s", self.compile_get("s", namespace).join(("f(", ")")), namespace)
+        ), namespace)
+        # compiled functions replace the generic methods on the instance
+        self.get = attrgetter(field)
+        self.update, self.modify = namespace["update"], namespace["modify"]
+
+    def get(self, s):
+        return getattr(s, self.field)
+
+    def update(self, s, f):
+        """The whole s with the field modified by f"""
+        return self.set(f(self.get(s)))(s)
+
+    def modify(self, f):
+        update = self.update
+        return lambda s: update(s, f)
+
+    def compile_get(self, s, namespace):
+        # field properties of ADT classes are redefined on subclasses, so they can always be used
+        if self.field.isidentifier() and not iskeyword(self.field):
+            return "{}.{}".format(s, self.field)
+        return "{}({})".format(bind(namespace, self.get), s)
+
+    def compile_set(self, s, a, namespace):
+        new, getitem = bind(namespace, tuple.__new__), bind(namespace, tuple.__getitem__)
+        generic = "{new}(type({s}), {g}({s}, {before}) + ({a},) + {g}({s}, {after}))".format(
+            new=new, g=getitem, s=s, a=a,
+            before=bind(namespace, slice(None, self.index)), after=bind(namespace, slice(self.index + 1, None))
+        )
+        if not plain_indexing(self.cls):
+            return generic
+        # instances of the exact class are rebuilt field by field
+        cls = bind(namespace, self.cls)
+        values = "".join(
+            "{}, ".format(a if i == self.index else "{}[{}]".format(s, i)) for i in range(len(self.cls._fields))
+        )
+        return "({new}({c}, ({values})) if type({s}) is {c} else {generic})".format(
+            new=new, c=cls, s=s, values=values, generic=generic
+        )
+
+    def __repr__(self):
+        return "field_lens({}, {!r})".format(self.cls.__name__, self.field)
+
+
+_field_lens_template = """\
+def update(s, f):
+    return {updated}
+
+def modify(f):
+    def modified(s):
+        return {updated}
+    return modified
+"""
+
+
+class ConstructorPrism(Prism[S, A]):
+    """
+    Prism matching the instances of one constructor(class) of a sum type.
+    The focus is the value of the field for single-field classes,
+    and the tuple of field values otherwise(empty for singletons).
+    Use `constructor_prism` to get the shared instance for a class.
+    """
+    def __init__(self, cls):
+        self.cls = cls
+        namespace = {"Some": Some, "Nothing": Nothing, "NoMatch": NoMatch}
+        exec(_constructor_prism_template.format(
+            match=self.compile_match("s", namespace), recover=self.compile_recover("a", namespace)
+        ), namespace)
+        # compiled functions replace the generic methods on the instance
+        self.match, self.try_get, self.recover = namespace["match"], namespace["try_get"], namespace["recover"]
+
+    def match(self, s):
+        cls = self.cls
+        if type(s) is cls or isinstance(s, cls):
+            n = len(cls._fields)
+            return tuple.__getitem__(s, 0) if n == 1 else tuple.__getitem__(s, slice(0, n))
+        return NoMatch
+
+    def recover(self, a):
+        n = len(self.cls._fields)
+        return self.cls() if n == 0 else tuple.__new__(self.cls, (a,) if n == 1 else tuple(a))
+
+    def compile_match(self, s, namespace):
+        cls = bind(namespace, self.cls)
+        namespace.setdefault("NoMatch", NoMatch)
+        n = len(self.cls._fields)
+        if n == 1:
+            generic = "{}({}, 0)".format(bind(namespace, tuple.__getitem__), s)
+            focus = "{}[0]".format(s) if plain_indexing(self.cls) else generic
+        else:
+            generic = focus = "{}({}, {})".format(bind(namespace, tuple.__getitem__), s, bind(namespace, slice(0, n)))
+        return "({f} if type({s}) is {c} else {g} if isinstance({s}, {c}) else NoMatch)".format(
+            f=focus, g=generic, s=s, c=cls
+        )
+
+    def compile_recover(self, a, namespace):
+        cls = bind(namespace, self.cls)
+        n = len(self.cls._fields)
+        if n == 0:
+            return "{}()".format(cls)
+        new = bind(namespace, tuple.__new__)
+        if n == 1:
+            return "{}({}, ({},))".format(new, cls, a)
+        return "{}({}, tuple({}))".format(new, cls, a)
+
+    def __repr__(self):
+        return "constructor_prism({})".format(self.cls.__name__)
+
+
+_constructor_prism_template = """\
+def match(s):
+    return {match}
+
+def try_get(s):
+    a = {match}
+    return Nothing if a is NoMatch else Some(a)
+
+def recover(a):
+    return {recover}
+"""
+
+
+@ft.lru_cache(maxsize=None)
+def field_lens(cls, field: str) -> FieldLens:
+    """The lens on the given field of ADT class cls"""
+    return FieldLens(cls, field)
+
+
+def field_lenses(cls) -> types.SimpleNamespace:
+    """Namespace of the lenses on each field of ADT class cls, by field name"""
+    return types.SimpleNamespace(**{field: field_lens(cls, field) for field in cls._fields})
+
+
+@ft.lru_cache(maxsize=None)
+def constructor_prism(cls) -> ConstructorPrism:
+    """The prism matching instances of ADT class cls"""
+    return ConstructorPrism(cls)
+
+
+def constructor_prisms(*classes) -> types.SimpleNamespace:
+    """Namespace of the prisms matching each of the constructors(classes) of a sum type, by class name"""
+    return types.SimpleNamespace(**{cls.__name__: constructor_prism(cls) for cls in classes})
@@ -3,6 +3,12 @@ import typing
 from typing import Generic, Callable, Any
 import functools as ft
 import types
+import copy
+from keyword import iskeyword
+from collections import ChainMap
+from collections.abc import MutableMapping, MutableSequence
+from funklib.datatypes.option import Option
+from funklib.datatypes.persistent import PersistentMap
 
 
 S = typing.TypeVar("S")
@@ -17,8 +23,8 @@ class Getter(abc.ABC, Generic[S, A]):
 
     def then(self, getter: "Getter[A, B]") -> "Getter[S, B]":
         return ComposedGetter(
-            *self if isinstance(self, ComposedGetter) else self,
-            *getter if isinstance(getter, ComposedGetter) else getter
+            *(self if isinstance(self, ComposedGetter) else (self,)),
+            *(getter if isinstance(getter, ComposedGetter) else (getter,))
         )
 
     def __call__(self, s):
@@ -43,8 +49,8 @@ class Setter(abc.ABC, Generic[S, A]):
 
     def then(self, setter: "Setter[A, B]") -> "Setter[S, B]":
         return ComposedSetter(
-            *self if isinstance(self, ComposedSetter) else self,
-            *setter if isinstance(setter, ComposedSetter) else setter
+            *(self if isinstance(self, ComposedSetter) else (self,)),
+            *(setter if isinstance(setter, ComposedSetter) else (setter,))
         )
 
 
@@ -59,6 +65,8 @@ class ComposedSetter(tuple, Setter[S, B]):
 
 class Lens(abc.ABC, Generic[S, A]):
     __slots__ = ()
+    # whether the lens can assign its focus in place(see `modify_in_place`)
+    in_place = False
 
     @abc.abstractmethod
     def modify(self, f: Callable[[A], A]) -> Callable[[S], S]:
@@ -71,10 +79,65 @@ class Lens(abc.ABC, Generic[S, A]):
     def get(self, s: S) -> A:
         pass
 
+    def compile_get(self, s: str, namespace: dict) -> str:
+        """
+        Python expression for the focus of the lens in the value of variable `s`,
+        used to generate the code of composed lenses.
+        Names used in the expression are added to `namespace`.
+        """
+        return "{}({})".format(bind(namespace, self.get), s)
+
+    def compile_set(self, s: str, a: str, namespace: dict) -> str:
+        """
+        Python expression for the value of variable `s` with its focus replaced by the value of variable `a`,
+        used to generate the code of composed lenses.
+        Names used in the expression are added to `namespace`.
+        """
+        return "{}({})({})".format(bind(namespace, self.set), a, s)
+
+    def modify_in_place(self, f: Callable[[A], A]) -> Callable[[S], S]:
+        """
+        Unsafe modification: the returned function mutates the structure holding the focus
+        and returns the whole, instead of rebuilding it.
+        Only for mutable structures exclusively owned by the caller;
+        lenses which cannot assign their focus in place raise TypeError.
+        """
+        raise TypeError("{!r} cannot modify in place".format(self))
+
+    def compile_assign(self, s: str, a: str, namespace: dict) -> str:
+        """
+        Python statement assigning in place the value of variable `a` to the focus in the value of variable `s`,
+        used to generate the code of composed lenses, for lenses which can modify in place.
+        Names used in the statement are added to `namespace`.
+        """
+        raise TypeError("{!r} cannot modify in place".format(self))
+
+    def can_assign(self, s: S) -> bool:
+        """Whether the focus can be assigned in place in the whole s, which may be immutable at runtime"""
+        return self.in_place
+
+    def compile_can_assign(self, s: str, namespace: dict) -> str:
+        """
+        Python expression for `can_assign` on the value of variable `s`,
+        used to generate the code of composed lenses.
+        Names used in the expression are added to `namespace`.
+        """
+        return "{}({})".format(bind(namespace, self.can_assign), s)
+
+    def modify_many(self, records, f: Callable[[A], A], in_place=False) -> typing.List[S]:
+        """
+        Modify the focus of each of records with f, building the modifier once for the batch.
+        With `in_place`, records are mutated as with `modify_in_place`.
+        """
+        return list(map(self.modify_in_place(f) if in_place else self.modify(f), records))
+
     def then(self, lens: "Lens[A, B]") -> "Lens[S, B]":
+        if not isinstance(lens, Lens):
+            from funklib.optics.traversal import traversal
+            return traversal(self).then(lens)
         return ComposedLens(
-            *self if isinstance(self, ComposedLens) else self,
-            *lens if isinstance(lens, ComposedLens) else lens
+            *(self if isinstance(self, ComposedLens) else (self,)),
+            *(lens if isinstance(lens, ComposedLens) else (lens,))
         )
 
     @classmethod
@@ -101,26 +164,162 @@ class Lens(abc.ABC, Generic[S, A]):
         )()
 
 
+def bind(namespace, value):
+    """Add value to the namespace of generated code, returning its name"""
+    name = "_{}".format(len(namespace))
+    namespace[name] = value
+    return name
+
+
+_composed_template = """\
+def get(s0):
+{gets}
+    return s{n}
+
+def update(s0, f):
+{gets}
+    a = f(s{n})
+{sets}
+    return a
+
+def update_in_place(s0, f):
+{gets}
+    a = f(s{n})
+{inner_sets}{assigns}    raise TypeError(_message)
+"""
+
+
+def compile_lenses(lenses):
+    """
+    Generate the getter, the updater(taking the whole and a function modifying the focus)
+    and the in-place updater of the composition of lenses, as single flat functions.
+    The in-place updater mutates the structure of the deepest lens which can modify in place,
+    rebuilding the levels below it. Whether a structure can be mutated is checked at runtime(see `Lens.can_assign`),
+    immutable ones being rebuilt and assigned one level up;
+    it raises TypeError if no structure along the path can be mutated.
+    """
+    namespace = {"TypeError": TypeError}
+    n = len(lenses)
+    gets = "".join("    s{} = {}\n".format(i + 1, lens.compile_get("s{}".format(i), namespace))
+                   for i, lens in enumerate(lenses))
+
+    def compile_sets(start):
+        return "".join("    a = {}\n".format(lenses[i].compile_set("s{}".format(i), "a", namespace))
+                       for i in reversed(range(start, n)))
+    deepest = next((i for i in reversed(range(n)) if lenses[i].in_place), None)
+    namespace["_message"] = "No structure along {!r} can be modified in place".format(lenses)
+    if deepest is None:
+        inner_sets, assigns = "", ""
+    else:
+        inner_sets = compile_sets(deepest + 1)
+        assigns = []
+        for i in reversed(range(deepest + 1)):
+            s = "s{}".format(i)
+            if lenses[i].in_place:
+                assigns.append("    if {}:\n        {}\n        return s0\n".format(
+                    lenses[i].compile_can_assign(s, namespace), lenses[i].compile_assign(s, "a", namespace)
+                ))
+            if i > 0:
+                assigns.append("    a = {}\n".format(lenses[i].compile_set(s, "a", namespace)))
+        assigns = "".join(assigns)
+    exec(_composed_template.format(
+        gets=gets, sets=compile_sets(0), inner_sets=inner_sets, assigns=assigns, n=n
+    ), namespace)
+    return namespace["get"], namespace["update"], namespace["update_in_place"]
+
+
 class ComposedLens(tuple, Lens[S, B]):
+    """
+    Composition of lenses.
+    On first use, the composition is compiled into a flat generated getter and updater,
+    cached on the instance(see `compile`).
+    """
     def __new__(cls, *lenses):
         return tuple.__new__(cls, lenses)
 
+    def compile(self):
+        """
+        Compile the lenses, replacing `get`, `update` and `update_in_place` on this instance
+        by the generated functions
+        """
+        self.get, self.update, self.update_in_place = compile_lenses(self)
+        return self
+
     def get(self, s):
-        return ft.reduce(lambda x, g: g.get(x), self, s)
+        return self.compile().get(s)
+
+    def update(self, s, f):
+        """The whole s with its focus modified by f"""
+        return self.compile().update(s, f)
+
+    def update_in_place(self, s, f):
+        """
+        Unsafe update, mutating the deepest structure which can be modified in place
+        (see `Lens.modify_in_place`), and rebuilding the levels below it
+        """
+        return self.compile().update_in_place(s, f)
 
     def modify(self, f):
-        modifier = ft.reduce(lambda x, lens: lens.modify(x), reversed(self), f)
-        return modifier
+        update = self.update if "update" in vars(self) else self.compile().update
+        return lambda s: update(s, f)
+
+    def modify_in_place(self, f):
+        update = self.update_in_place if "update" in vars(self) else self.compile().update_in_place
+        return lambda s: update(s, f)
+
+    def modify_many(self, records, f, in_place=False):
+        if "update" not in vars(self):
+            self.compile()
+        update = self.update_in_place if in_place else self.update
+        return [update(s, f) for s in records]
+
+    def compile_get(self, s, namespace):
+        return "{}({})".format(bind(namespace, self.get), s)
+
+    def compile_set(self, s, a, namespace):
+        return "{}({}, lambda _: {})".format(bind(namespace, self.update), s, a)
 
 
 def update_key(m, k, v):
-    mm = dict(m)
+    """
+    Mapping m with key k mapped to v, sharing structure with m where its type allows it:
+    persistent maps are updated in near-constant time,
+    and ChainMap overlays only copy their first map, sharing the underlying ones.
+    Other mappings are copied into a dict.
+    """
+    if type(m) is dict:
+        mm = m.copy()
+    elif isinstance(m, PersistentMap):
+        return m.set(k, v)
+    elif isinstance(m, ChainMap):
+        top = dict(m.maps[0])
+        top[k] = v
+        return m.__class__(top, *m.maps[1:])
+    else:
+        mm = dict(m)
     mm[k] = v
     return mm
 
 
+def update_index(t, i, v):
+    """
+    Sequence t with the element at index i replaced by v:
+    tuples by slicing concatenation, other sequences, such as lists, by assigning into a copy
+    """
+    if not isinstance(t, tuple):
+        tt = t.copy() if type(t) is list else type(t)(t)
+        tt[i] = v
+        return tt
+    if i < 0:
+        i += len(t)
+    if not 0 <= i < len(t):
+        raise IndexError("tuple index out of range")
+    return t[:i] + (v,) + t[i + 1:]
+
+
 class DictItem(Lens[dict, Any]):
     __slots__ = ["key"]
+    in_place = True
 
     def __init__(self, key):
         self.key = key
@@ -132,9 +331,36 @@ class DictItem(Lens[dict, Any]):
         key = self.key
         return lambda s: update_key(s, key, f(s[key]))
 
+    def modify_in_place(self, f):
+        key = self.key
+
+        def mutate(s):
+            s[key] = f(s[key])
+            return s
+        return mutate
+
+    def compile_get(self, s, namespace):
+        return "{}[{}]".format(s, bind(namespace, self.key))
+
+    def compile_set(self, s, a, namespace):
+        return "{}({}, {}, {})".format(bind(namespace, update_key), s, bind(namespace, self.key), a)
+
+    def compile_assign(self, s, a, namespace):
+        return "{}[{}] = {}".format(s, bind(namespace, self.key), a)
+
+    def can_assign(self, s):
+        return isinstance(s, MutableMapping)
+
+    def compile_can_assign(self, s, namespace):
+        return "type({s}) is dict or {}({s}, {})".format(
+            bind(namespace, isinstance), bind(namespace, MutableMapping), s=s
+        )
+
 
 class TupleItem(Lens[tuple, Any]):
     __slots__ = ["index"]
+    # in place for mutable sequences, such as lists
+    in_place = True
 
     def __init__(self, index: int):
         self.index = index
@@ -144,11 +370,46 @@ class TupleItem(Lens[tuple, Any]):
 
     def modify(self, f):
         index = self.index
-        return lambda s: tuple(f(x) if i == index else x for i, x in enumerate(s))
+        if index >= 0:
+            return lambda s: (s[:index] + (f(s[index]),) + s[index + 1:] if type(s) is tuple
+                              else update_index(s, index, f(s[index])))
+        return lambda s: update_index(s, index, f(s[index]))
+
+    def modify_in_place(self, f):
+        """In-place modification of a mutable sequence, such as a list"""
+        index = self.index
+
+        def mutate(s):
+            s[index] = f(s[index])
+            return s
+        return mutate
+
+    def compile_get(self, s, namespace):
+        return "{}[{}]".format(s, self.index)
+
+    def compile_set(self, s, a, namespace):
+        update = bind(namespace, update_index)
+        if self.index >= 0:
+            return "({s}[:{i}] + ({a},) + {s}[{j}:] if type({s}) is tuple else {u}({s}, {i}, {a}))".format(
+                s=s, a=a, i=self.index, j=self.index + 1, u=update
+            )
+        return "{}({}, {}, {})".format(update, s, self.index, a)
+
+    def compile_assign(self, s, a, namespace):
+        return "{}[{}] = {}".format(s, self.index, a)
+
+    def can_assign(self, s):
+        return isinstance(s, MutableSequence)
+
+    def compile_can_assign(self, s, namespace):
+        return "type({s}) is list or {}({s}, {})".format(
+            bind(namespace, isinstance), bind(namespace, MutableSequence), s=s
+        )
 
 
 class Attribute(Lens[Any, Any]):
     __slots__ = ["attr", "constructor"]
+    in_place = True
 
     def __init__(self, attr, constructor=None):
         self.attr = attr
@@ -157,7 +418,37 @@ class Attribute(Lens[Any, Any]):
     def get(self, s):
         return getattr(s, self.attr)
 
+    def compile_get(self, s, namespace):
+        if self.attr.isidentifier() and not iskeyword(self.attr):
+            return "{}.{}".format(s, self.attr)
+        return super().compile_get(s, namespace)
+
     def modify(self, f):
         attr = self.attr
         cons = self.constructor
+        if cons is None:
+            return lambda s: update_attribute(s, attr, f(getattr(s, attr)))
         return lambda s: cons(update_key(vars(s), attr, f(getattr(s, attr))))
+
+    def modify_in_place(self, f):
+        attr = self.attr
+
+        def mutate(s):
+            setattr(s, attr, f(getattr(s, attr)))
+            return s
+        return mutate
+
+    def compile_assign(self, s, a, namespace):
+        return "{}({}, {}, {})".format(bind(namespace, setattr), s, bind(namespace, self.attr), a)
+
+    def can_assign(self, s):
+        # named tuples and frozen dataclasses reject attribute assignment
+        params = getattr(s, "__dataclass_params__", None)
+        return not isinstance(s, tuple) and not (params is not None and params.frozen)
+
+
+def update_attribute(s, attr, v):
+    """Shallow copy of s with attribute attr set to v, without going through its constructor"""
+    ss = copy.copy(s)
+    object.__setattr__(ss, attr, v)
+    return ss
@@ -5,6 +5,7 @@ import functools as ft
 import operator as op
 from funklib.datatypes.option import Option, Some, Nothing
 from funklib.core.prelude import singleton
+from funklib.optics.lens import bind
 import types
 
 
@@ -13,27 +14,85 @@ A = typing.TypeVar("A")
 B = typing.TypeVar("B")
 
 
+@singleton()
+class NoMatch:
+    """Sentinel returned by `Prism.match` for values not matched by the prism"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return "NoMatch"
+
+
 class Prism(abc.ABC, Generic[S, A]):
+    """
+    Optic focusing on a part of a whole which may or may not be present.
+    Implementations define `recover` and at least one of `try_get` and `match`,
+    each being derived from the other by default.
+    `match` is the allocation-free protocol used internally, returning the focus or the `NoMatch` sentinel;
+    Some/Nothing are only built by the public `try_get` and `try_modify`.
+    """
     __slots__ = ()
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # try_get and match are derived from each other, so concrete prisms must define one of them
+        abstract = any(getattr(value, "__isabstractmethod__", False) for value in vars(cls).values()) or any(
+            getattr(getattr(cls, name, None), "__isabstractmethod__", False)
+            for base in cls.__bases__ for name in getattr(base, "__abstractmethods__", ())
+        )
+        if not abstract and cls.try_get is Prism.try_get and cls.match is Prism.match:
+            raise TypeError("Prism class {} must define try_get or match".format(cls.__name__))
+
     @abc.abstractmethod
     def recover(self, a: A) -> S: pass
 
-    @abc.abstractmethod
-    def try_get(self, s: S) -> Option[A]: pass
+    def try_get(self, s: S) -> Option[A]:
+        a = self.match(s)
+        return Nothing if a is NoMatch else Some(a)
+
+    def match(self, s: S):
+        """The focus of the prism in s, or `NoMatch`"""
+        return self.try_get(s).get(NoMatch)
+
+    def compile_match(self, s: str, namespace: dict) -> str:
+        """
+        Python expression evaluating to the focus in the value of variable `s`, or `NoMatch`,
+        used to generate the code of composed prisms.
+        Names used in the expression are added to `namespace`.
+        """
+        return "{}({})".format(bind(namespace, self.match), s)
+
+    def compile_recover(self, a: str, namespace: dict) -> str:
+        """
+        Python expression for the whole recovered from the value of variable `a`,
+        used to generate the code of composed prisms.
+        """
+        return "{}({})".format(bind(namespace, self.recover), a)
 
     def try_modify(self, f: Callable[[A], A]) -> Callable[[S], Option[S]]:
+        match = self.match
         recover = self.recover
-        try_get = self.try_get
-        return lambda s: try_get(s).map(lambda a: recover(f(a)))
+
+        def try_modify(s):
+            a = match(s)
+            return Nothing if a is NoMatch else Some(recover(f(a)))
+        return try_modify
+
+    def update(self, s: S, f: Callable[[A], A]) -> S:
+        """s with its focus modified by f if it matches, or s itself"""
+        a = self.match(s)
+        return s if a is NoMatch else self.recover(f(a))
 
     def __call__(self, a: A):
         return self.recover(a)
 
     def then(self, prism):
+        if not isinstance(prism, Prism):
+            from funklib.optics.traversal import traversal
+            return traversal(self).then(prism)
         return ComposedPrism(
-            *self if isinstance(self, ComposedPrism) else self,
-            *prism if isinstance(self, prism) else prism
+            *(self if isinstance(self, ComposedPrism) else (self,)),
+            *(prism if isinstance(prism, ComposedPrism) else (prism,))
         )
 
     @classmethod
@@ -58,19 +117,33 @@ class Prism(abc.ABC, Generic[S, A]):
             exec_body=update_ns
         )()
 
+    @classmethod
+    def from_match(cls, match: Callable[[S], Any], recover: Callable[[A], S], name=None) -> "Prism[S, A]":
+        """Prism from a function returning the focus of a value or `NoMatch`"""
+        def update_ns(ns):
+            ns["__slots__"] = ()
+            ns["match"] = staticmethod(match)
+            ns["recover"] = staticmethod(recover)
+            ns["__repr__"] = lambda self: type(self).__name__
+
+        # create new type for implementation, but directly return instance, like a singleton
+        return types.new_class(
+            name or "Prism.from_match(match={}, recover={})".format(match, recover),
+            (Prism,),
+            exec_body=update_ns
+        )()
+
     @classmethod
     def from_partial(cls, partial_get: Callable[[S], A], recover: Callable[[A], S], modify=None, name=None) -> "Prism[S, A]":
-        def try_get(s):
+        def match(s):
             try:
-                a = partial_get(s)
+                return partial_get(s)
             except (TypeError, ValueError):
-                return Nothing
-            else:
-                return Some(a)
+                return NoMatch
 
         def update_ns(ns):
             ns["__slots__"] = ()
-            ns["try_get"] = staticmethod(try_get)
+            ns["match"] = staticmethod(match)
             ns["recover"] = staticmethod(recover)
             ns["__repr__"] = lambda self: type(self).__name__
             if modify is not None:
@@ -78,42 +151,82 @@ class Prism(abc.ABC, Generic[S, A]):
         
         # create new type for implementation, but directly return instance, like a singleton
         return types.new_class(
-            name or "Prism.from_partial(try_get={}, recover={}, modify={})".format(try_get, recover, modify),
+            name or "Prism.from_partial(partial_get={}, recover={}, modify={})".format(partial_get, recover, modify),
             (Prism,),
             exec_body=update_ns
         )()
 
 
+_composed_template = """\
+def match(s0):
+{matches}
+    return s{n}
+
+def recover(a):
+    return {recover}
+"""
+
+
+def compile_prisms(prisms):
+    """
+    Generate the matcher and the recovering function of the composition of prisms,
+    as single flat functions returning at the first failed match.
+    """
+    namespace = {"NoMatch": NoMatch}
+    matches = "".join(
+        "    s{j} = {m}\n    if s{j} is NoMatch:\n        return NoMatch\n".format(
+            j=i + 1, m=prism.compile_match("s{}".format(i), namespace)
+        )
+        for i, prism in enumerate(prisms)
+    )
+    recover = ft.reduce(lambda a, prism: prism.compile_recover(a, namespace), reversed(prisms), "a")
+    exec(_composed_template.format(matches=matches, recover=recover, n=len(prisms)), namespace)
+    return namespace["match"], namespace["recover"]
+
+
 class ComposedPrism(tuple, Prism[S, A]):
+    """
+    Composition of prisms.
+    On first use, the composition is compiled into a flat generated matcher and recovering function,
+    cached on the instance(see `compile`).
+    """
     def __new__(cls, *prisms):
         return tuple.__new__(cls, prisms)
 
-    def try_get(self, s: S):
-        return ft.reduce(lambda x, p: x.then(p.try_get), self, Some(s))
+    def compile(self):
+        """Compile the prisms, replacing `match` and `recover` on this instance by the generated functions"""
+        self.match, self.recover = compile_prisms(self)
+        return self
+
+    def match(self, s: S):
+        return self.compile().match(s)
 
     def recover(self, a: A):
-        return ft.reduce(lambda x, p: p.recover(x), reverse(self), a)
+        return self.compile().recover(a)
 
 
 @singleton()
 class None_(Prism[Any, None]):
     __slots__ = ()
-    
-    def try_get(self, s):
-        return Some(s) if s is None else Nothing
+
+    def match(self, s):
+        return s if s is None else NoMatch
+
+    def compile_match(self, s, namespace):
+        return "({s} if {s} is None else NoMatch)".format(s=s)
 
     def recover(self, a):
         return a
 
 
-Nothing_: Prism[Any, Option] = Prism.from_functions(
-    try_get=lambda s: Some(s) if s is Nothing else Nothing,
+Nothing_: Prism[Any, Option] = Prism.from_match(
+    match=lambda s: s if s is Nothing else NoMatch,
     recover=lambda a: Nothing
 )
 
 
-Some_: Prism[Option[A], A] = Prism.from_functions(
-    try_get=lambda s: s,
+Some_: Prism[Option[A], A] = Prism.from_match(
+    match=lambda s: s.get(NoMatch),
     recover=Some
 )
 
@@ -122,8 +235,8 @@ def attribute(attr: str, constructor: Callable[[A], S]) -> Prism[S, A]:
     """
     Prism for objects exposing an attribute
     """
-    return Prism.from_functions(
-        try_get=lambda s: Some(getattr(s, attr)) if hasattr(s, attr) else Nothing,
+    return Prism.from_match(
+        match=lambda s: getattr(s, attr, NoMatch),
         recover=constructor
     )
 
@@ -0,0 +1,214 @@
+import abc
+import typing
+from typing import Generic, Callable, Iterable, Any
+from funklib.optics.lens import Lens, Getter
+from funklib.optics.prism import Prism, NoMatch
+
+
+S = typing.TypeVar("S")
+A = typing.TypeVar("A")
+B = typing.TypeVar("B")
+
+
+class Fold(abc.ABC, Generic[S, A]):
+    """Optic focusing on any number of parts of a whole, for reading"""
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def foci(self, s: S) -> Iterable[A]:
+        pass
+
+    def get_all(self, s: S) -> typing.List[A]:
+        return list(self.foci(s))
+
+    def then(self, optic) -> "Fold[S, B]":
+        optic = traversal(optic)
+        optics = (
+            *(self if isinstance(self, ComposedFold) else (self,)),
+            *(optic if isinstance(optic, ComposedFold) else (optic,))
+        )
+        # consecutive lenses are composed as a lens, to be compiled
+        merged = []
+        for o in optics:
+            if merged and isinstance(o, LensTraversal) and isinstance(merged[-1], LensTraversal):
+                merged[-1] = LensTraversal(merged[-1].lens.then(o.lens))
+            else:
+                merged.append(o)
+        optics = tuple(merged)
+        if len(optics) == 1:
+            return optics[0]
+        if all(isinstance(o, Traversal) for o in optics):
+            return ComposedTraversal(*optics)
+        return ComposedFold(*optics)
+
+
+class Traversal(Fold[S, A]):
+    """
+    Optic focusing on any number of parts of a whole, for reading and updating.
+    An update modifies all foci with a single rebuild of the whole.
+    """
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def update(self, s: S, f: Callable[[A], A]) -> S:
+        pass
+
+    def updater(self, f: Callable[[A], A]) -> Callable[[S], S]:
+        """Function updating a whole with f"""
+        update = self.update
+        return lambda s: update(s, f)
+
+    def modify(self, f: Callable[[A], A]) -> Callable[[S], S]:
+        return self.updater(f)
+
+    def set(self, new: A) -> Callable[[S], S]:
+        return self.modify(lambda _: new)
+
+    def modify_many(self, records: Iterable[S], f: Callable[[A], A]) -> typing.List[S]:
+        """Update each of records with f, building the updater once for the batch"""
+        return list(map(self.updater(f), records))
+
+
+class ComposedFold(tuple, Fold[S, A]):
+    def __new__(cls, *folds):
+        return tuple.__new__(cls, folds)
+
+    def foci(self, s):
+        xs = (s,)
+        for fold in self:
+            xs = [y for x in xs for y in fold.foci(x)]
+        return xs
+
+
+class ComposedTraversal(ComposedFold, Traversal[S, A]):
+    def updater(self, f):
+        for t in reversed(self):
+            f = t.updater(f)
+        return f
+
+    def update(self, s, f):
+        return self.updater(f)(s)
+
+
+class Each(Traversal[Iterable[A], A]):
+    """Traversal over the elements of a list, tuple or other iterable collection"""
+    __slots__ = ()
+
+    def foci(self, s):
+        return s
+
+    def update(self, s, f):
+        t = type(s)
+        if t is list:
+            return list(map(f, s))
+        elif t is tuple:
+            return tuple(map(f, s))
+        else:
+            return t(map(f, s))
+
+
+class Filtered(Traversal[A, A]):
+    """Traversal focusing on the whole if it satisfies predicate"""
+    __slots__ = ["predicate"]
+
+    def __init__(self, predicate: Callable[[A], bool]):
+        self.predicate = predicate
+
+    def foci(self, s):
+        return (s,) if self.predicate(s) else ()
+
+    def update(self, s, f):
+        return f(s) if self.predicate(s) else s
+
+    def updater(self, f):
+        predicate = self.predicate
+        return lambda s: f(s) if predicate(s) else s
+
+
+class Indices(Traversal[typing.Sequence[A], A]):
+    """Traversal over the elements at the given indices of a list or tuple"""
+    __slots__ = ["indices"]
+
+    def __init__(self, *indices: int):
+        self.indices = indices
+
+    def foci(self, s):
+        return [s[i] for i in self.indices]
+
+    def update(self, s, f):
+        elements = list(s)
+        for i in self.indices:
+            elements[i] = f(elements[i])
+        return elements if type(s) is list else type(s)(elements)
+
+
+class DictValues(Traversal[dict, Any]):
+    """Traversal over the values of a dict"""
+    __slots__ = ()
+
+    def foci(self, s):
+        return s.values()
+
+    def update(self, s, f):
+        return {k: f(v) for k, v in s.items()}
+
+
+class LensTraversal(Traversal[S, A]):
+    """Traversal focusing on the focus of a lens"""
+    __slots__ = ["lens"]
+
+    def __init__(self, lens: Lens[S, A]):
+        self.lens = lens
+
+    def foci(self, s):
+        return (self.lens.get(s),)
+
+    def update(self, s, f):
+        return self.lens.modify(f)(s)
+
+    def updater(self, f):
+        return self.lens.modify(f)
+
+
+class PrismTraversal(Traversal[S, A]):
+    """Traversal focusing on the focus of a prism, if it matches"""
+    __slots__ = ["prism"]
+
+    def __init__(self, prism: Prism[S, A]):
+        self.prism = prism
+
+    def foci(self, s):
+        a = self.prism.match(s)
+        return () if a is NoMatch else (a,)
+
+    def update(self, s, f):
+        return self.prism.update(s, f)
+
+    def updater(self, f):
+        update = self.prism.update
+        return lambda s: update(s, f)
+
+
+class GetterFold(Fold[S, A]):
+    """Fold focusing on the value of a getter"""
+    __slots__ = ["getter"]
+
+    def __init__(self, getter: Getter[S, A]):
+        self.getter = getter
+
+    def foci(self, s):
+        return (self.getter.get(s),)
+
+
+def traversal(optic) -> Fold:
+    """The optic as a traversal(or a fold for getters)"""
+    if isinstance(optic, Fold):
+        return optic
+    elif isinstance(optic, Lens):
+        return LensTraversal(optic)
+    elif isinstance(optic, Prism):
+        return PrismTraversal(optic)
+    elif isinstance(optic, Getter):
+        return GetterFold(optic)
+    else:
+        raise TypeError("Expected an optic, got {!r}".format(optic))
@@ -0,0 +1,66 @@
+import pickle
+import pytest
+
+adt = pytest.importorskip("funklib.datatypes.adt")
+data = adt.data
+
+
+class Point(data):
+    _fields = ("x", "y")
+
+
+class Cached(data, cached=True):
+    _fields = ("value",)
+
+
+class Interned(data, interned=True):
+    _fields = ("value",)
+
+
+class Unit(data):
+    _fields = ()
+
+
+class Custom(data):
+    _fields = ("value",)
+
+    def __new__(cls, value):
+        return data.__new__(cls, value * 2)
+
+
+def test_generated_constructor():
+    p = Point(1, y=2)
+    assert p == (1, 2)
+    assert (p.x, p.y) == (1, 2)
+    assert Point.__new__._generated
+    with pytest.raises(TypeError):
+        Point(1)
+
+
+def test_hand_written_constructor_kept():
+    assert Custom(2).value == 4
+    assert not getattr(Custom.__new__, "_generated", False)
+
+
+def test_cached_constructor():
+    assert Cached(1) is Cached(1)
+    assert Cached(1) is not Cached(2)
+
+
+def test_zero_field_class_is_singleton():
+    assert Unit() is Unit()
+
+
+def test_interning_identity():
+    constant = object()
+    interned = Interned.intern(constant)
+    assert Interned(constant) is interned
+    assert Interned(object()) is not interned
+    with pytest.raises(TypeError):
+        Point.intern(1, 2)
+
+
+def test_pickle_round_trip():
+    p = Point(1, 2)
+    assert pickle.loads(pickle.dumps(p)) == p
+    assert pickle.loads(pickle.dumps(Unit())) is Unit()
@@ -0,0 +1,261 @@
+import io
+import pickle
+import random
+import pytest
+from funklib.datatypes.tupleclass import tupleclass
+from funklib.datatypes.evolve import (
+    compile_deltas, ListIncubator, TupleIncubator, DictIncubator, SetIncubator, Journal, Delta,
+    ListAppend, ListExtend, ListPop, ListTruncate, ListSet, ListUpdate, TupleSet, TupleUpdate, DictSet,
+    NoOp, UndoLog
+)
+
+
+@tupleclass(["key"])
+class Clear(Delta):
+    def apply(self, initial):
+        return [self.key] * len(initial)
+
+
+@tupleclass(["index", "value"])
+class Scale(Delta):
+    def apply(self, initial):
+        initial[self.index] *= self.value
+        return initial
+
+
+def one_at_a_time(incubator):
+    value = incubator.copy(incubator.initial)
+    for d in incubator.delta:
+        value = d.apply(value)
+    return value
+
+
+def test_compile_merges_long_runs_only():
+    short = [ListAppend(x) for x in range(ListAppend.min_batch - 1)]
+    assert compile_deltas(short) == short
+    long = [ListAppend(x) for x in range(ListAppend.min_batch)]
+    assert compile_deltas(long) == [ListExtend(list(range(ListAppend.min_batch)))]
+    pops = [ListPop()] * ListPop.min_batch
+    assert compile_deltas(pops + [NoOp()] + pops) == [ListTruncate(len(pops)), NoOp(), ListTruncate(len(pops))]
+
+
+def test_compile_merges_mixed_appends_and_extends():
+    run = [ListAppend(0), ListExtend([1, 2])] * ListAppend.min_batch
+    assert compile_deltas(run) == [ListExtend([0, 1, 2] * ListAppend.min_batch)]
+
+
+def test_compile_merges_tuple_sets():
+    assert compile_deltas([TupleSet(0, "a"), TupleSet(2, "b")]) == [TupleUpdate({0: "a", 2: "b"})]
+
+
+def test_tuple_set():
+    assert TupleSet(1, "x").apply((1, 2, 3)) == (1, "x", 3)
+    assert TupleSet(5, "x").apply((1, 2, 3)) == (1, 2, 3)
+
+
+@pytest.mark.parametrize("in_place", [False, True])
+def test_list_persist_matches_one_at_a_time(in_place):
+    rng = random.Random(0)
+    incubator = ListIncubator(list(range(100)), in_place=in_place)
+    for _ in range(2000):
+        op = rng.randrange(4)
+        if op == 0 or len(incubator.initial) + len(incubator.delta) < 10:
+            for _ in range(rng.randrange(1, 100)):
+                incubator.append(rng.random())
+        elif op == 1:
+            incubator[rng.randrange(10)] = rng.random()
+        elif op == 2:
+            for _ in range(rng.randrange(1, 5)):
+                incubator.pop()
+        else:
+            incubator.extend([1, 2, 3])
+    reference = ListIncubator(list(incubator.initial))
+    reference.delta.extend(incubator.delta)
+    expected = one_at_a_time(reference)
+    assert incubator.persist() == expected
+    assert incubator.initial == expected
+    assert incubator.delta == []
+
+
+def test_tuple_persist_matches_one_at_a_time():
+    incubator = TupleIncubator(tuple(range(10)))
+    for x in range(20):
+        incubator.append(x)
+    incubator[3] = "a"
+    incubator[25] = "b"
+    incubator.pop()
+    incubator.pop()
+    incubator.extend("xyz")
+    expected = one_at_a_time(incubator)
+    assert incubator.persist() == expected
+
+
+def test_failed_persist_leaves_value_unchanged():
+    value = [1, 2, 3]
+    incubator = ListIncubator(value)
+    incubator.append(4)
+    for _ in range(10):
+        incubator.pop()
+    with pytest.raises(IndexError):
+        incubator.persist()
+    assert incubator.initial == [1, 2, 3]
+
+
+def test_dict_and_set_incubators():
+    d = {"a": 1, "b": 2}
+    incubator = DictIncubator(d)
+    incubator["c"] = 3
+    del incubator["a"]
+    incubator.update({"b": 20})
+    assert incubator.persist() == {"b": 20, "c": 3}
+    assert d == {"a": 1, "b": 2}
+
+    s = {1, 2, 3}
+    incubator = SetIncubator(s)
+    incubator.add(4)
+    incubator.discard(1)
+    incubator.update([5, 6])
+    incubator.difference_update([6])
+    assert incubator.persist() == {2, 3, 4, 5}
+    assert s == {1, 2, 3}
+
+
+def test_savepoints():
+    incubator = ListIncubator([])
+    incubator.append(1)
+    outer = incubator.savepoint()
+    incubator.append(2)
+    inner = incubator.savepoint()
+    incubator.append(3)
+    inner.rollback()
+    assert incubator.persist() == [1, 2]
+    incubator.append(4)
+    outer = incubator.savepoint()
+    incubator.append(5)
+    incubator.savepoint()
+    incubator.append(6)
+    outer.rollback()
+    assert incubator.persist() == [1, 2, 4]
+
+
+def test_savepoint_rolls_back_on_exception():
+    incubator = ListIncubator([])
+    incubator.append(1)
+    with pytest.raises(ValueError):
+        with incubator.savepoint():
+            incubator.append(2)
+            raise ValueError()
+    assert incubator.persist() == [1]
+
+
+def test_journal_replay():
+    journal = Journal()
+    incubator = ListIncubator([], journal=journal)
+    for x in range(10):
+        incubator.extend(range(x))
+        incubator.append(x)
+        incubator.pop(0)
+        incubator.persist()
+    assert len(journal) == 10
+    assert journal.replay(ListIncubator([])) == incubator.initial
+    assert journal.replay(ListIncubator([]), bulk=True) == incubator.initial
+
+
+def test_journal_round_trip():
+    entries = [
+        (ListAppend(1), ListAppend(-2), ListExtend([1, 2, 3]), ListSet(0, "a"), ListPop()),
+        (ListUpdate([(0, 1), (5, None)]), ListTruncate(2**70), NoOp(), NoOp()),
+        (DictSet(("a", 1), {"b": {1, 2}}), TupleSet(3, 1.5), TupleUpdate({0: -1, 1: b"x"})),
+        (Clear(0), Scale(1, 2), Scale(2, 3), ListAppend(object)),
+        (),
+    ]
+    loaded = Journal.loads(Journal(entries).dumps())
+    assert loaded.entries == entries
+    assert [list(map(type, e)) for e in loaded.entries] == [list(map(type, e)) for e in entries]
+
+
+def test_custom_delta_pickles():
+    assert pickle.loads(pickle.dumps(Clear(0))) == Clear(0)
+    assert type(pickle.loads(pickle.dumps(Scale(1, 2)))) is Scale
+
+
+def test_custom_delta_journal_replay():
+    journal = Journal()
+    incubator = ListIncubator([1, 2, 3], journal=journal)
+    incubator.delta.extend([Scale(0, 5), Clear(7), Scale(1, 2)])
+    assert incubator.persist() == [7, 14, 7]
+    assert Journal.loads(journal.dumps()).replay(ListIncubator([1, 2, 3])) == [7, 14, 7]
+
+
+def test_journal_stream():
+    stream = io.BytesIO()
+    journal = Journal(stream=stream)
+    incubator = ListIncubator([], journal=journal)
+    for x in range(5):
+        incubator.append(x)
+        incubator[0] = -x
+        incubator.persist()
+    assert Journal.loads(stream.getvalue()).entries == journal.entries
+    with pytest.raises(ValueError):
+        Journal.loads(b"FKJ0")
+
+
+def test_journal_smaller_than_pickle():
+    journal = Journal()
+    incubator = ListIncubator(list(range(1000)), journal=journal, in_place=True)
+    for x in range(1000):
+        incubator[x] = -x
+    incubator.persist()
+    for x in range(100):
+        incubator[x] = x
+        incubator.persist()
+    assert len(journal.dumps()) < len(pickle.dumps(journal.entries)) / 2
+
+
+def test_in_place_persist_mutates_value():
+    value = list(range(10))
+    incubator = ListIncubator(value, in_place=True)
+    incubator.append(10)
+    incubator[0] = -1
+    incubator.insert(1, "x")
+    incubator.pop(2)
+    result = incubator.persist()
+    assert result is value
+    assert value == [-1, "x", 2, 3, 4, 5, 6, 7, 8, 9, 10]
+    assert len(incubator.undo) == 0
+
+
+def test_in_place_rollback_on_failure():
+    value = list(range(10))
+    incubator = ListIncubator(value, in_place=True)
+    incubator.append(10)
+    incubator[0] = -1
+    incubator.insert(3, "x")
+    incubator.pop(5)
+    incubator.extend([11, 12])
+    for _ in range(4):
+        incubator.pop()
+    incubator[100] = 0
+    with pytest.raises(IndexError):
+        incubator.persist()
+    assert value == list(range(10))
+    assert len(incubator.undo) == 0
+
+
+def test_undo_log_records():
+    log = UndoLog()
+    value = [1, 2, 3]
+    ListSet(0, "a").apply_logged(value, log)
+    ListAppend(4).apply_logged(value, log)
+    ListPop().apply_logged(value, log)
+    ListTruncate(2).apply_logged(value, log)
+    assert value == ["a"]
+    assert list(log.ops) == [UndoLog.SET, UndoLog.TAIL, UndoLog.DELETE, UndoLog.TAIL]
+    log.rollback(value)
+    assert value == [1, 2, 3]
+    assert len(log) == 0
+
+
+def test_in_place_mode_not_supported():
+    with pytest.raises(TypeError):
+        TupleIncubator((), in_place=True)
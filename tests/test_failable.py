@@ -0,0 +1,80 @@
+import pytest
+
+failable = pytest.importorskip("funklib.datatypes.failable")
+Failable, Success, Failure = failable.Failable, failable.Success, failable.Failure
+run_failable, failable_program = failable.run_failable, failable.failable_program
+bounce = pytest.importorskip("funklib.datatypes.trampoline").bounce
+
+
+def consumed(values, seen):
+    """Iterator over values, recording each value taken in seen"""
+    for x in values:
+        seen.append(x)
+        yield x
+
+
+def test_collect_stops_at_first_failure():
+    seen = []
+    values = [Success(1), Failure("a"), Success(2), Failure("b")]
+    assert Failable.collect(consumed(values, seen)) == Failure("a")
+    assert len(seen) == 2
+    assert Failable.collect(iter([Success(1), Success(2)])) == Success((1, 2))
+
+
+def test_collect_all_single_pass():
+    values = [Success(1), Failure("a"), Success(2), Failure("b")]
+    assert Failable.collect_all(iter(values)) == Failure(("a", "b"))
+    assert Failable.collect_all(iter([Success(1), Success(2)])) == Success((1, 2))
+
+
+def test_partition():
+    values = [Success(1), Failure("a"), Success(2)]
+    assert Failable.partition(iter(values)) == ((1, 2), ("a",))
+
+
+def failing():
+    yield Success(1)
+    raise ValueError("child")
+
+
+def test_subprogram_exception_thrown_into_parent():
+    def parent():
+        try:
+            yield failing()
+        except ValueError as ex:
+            return str(ex)
+
+    assert run_failable(parent()) == Success("child")
+
+
+def test_bounce_exception_thrown_into_parent():
+    @failable_program
+    def child(x):
+        raise ValueError(x)
+
+    def parent():
+        try:
+            yield bounce(child, "bounced")
+        except ValueError as ex:
+            return str(ex)
+
+    assert run_failable(parent()) == Success("bounced")
+
+
+def test_uncaught_subprogram_exception_propagates():
+    def parent():
+        yield failing()
+
+    with pytest.raises(ValueError):
+        run_failable(parent())
+
+
+def test_subprogram_failure_stops_program():
+    def child():
+        yield Failure("error")
+
+    def parent():
+        yield child()
+        yield Success(1)
+
+    assert run_failable(parent()) == Failure("error")
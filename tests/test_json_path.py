@@ -0,0 +1,73 @@
+import pickle
+from collections import OrderedDict
+from types import SimpleNamespace
+import pytest
+
+path = pytest.importorskip("funklib.datatypes.path")
+JSONPath, AttrPath, PathSet = path.JSONPath, path.AttrPath, path.PathSet
+
+
+def test_from_string_is_cached():
+    p = JSONPath.from_string("/a/0/b")
+    assert p == JSONPath("a", "0", "b")
+    assert JSONPath.from_string("/a/0/b") is p
+    assert JSONPath.from_string("/a~1b/~0c") == JSONPath("a/b", "~c")
+    assert JSONPath.from_string("") == JSONPath()
+    with pytest.raises(ValueError):
+        JSONPath.from_string("a/b")
+
+
+def test_get_dicts_lists_and_abcs():
+    doc = {"a": [{"b": 1}, {"b": 2}], "c": OrderedDict(d=(3, 4))}
+    assert JSONPath.from_string("/a/1/b").get(doc) == 2
+    assert JSONPath.from_string("/a/-1/b").get(doc) == 2
+    assert JSONPath.from_string("/c/d/0").get(doc) == 3
+    assert JSONPath.from_string("/a/5/b").get(doc, "missing") == "missing"
+    assert JSONPath.from_string("/x/y").get(doc, "missing") == "missing"
+    assert JSONPath.from_string("/c/x").get(doc, "missing") == "missing"
+    assert JSONPath().get(doc) is doc
+    with pytest.raises(TypeError):
+        JSONPath.from_string("/a/0/b/c").get(doc)
+
+
+def test_get_many_matches_get():
+    docs = [{"a": [x, {"b": x}]} for x in range(10)] + [{"a": []}, {}]
+    p = JSONPath.from_string("/a/1/b")
+    assert p.get_many(docs, -1) == [p.get(doc, -1) for doc in docs]
+    assert p.get_many(docs[:3]) == [0, 1, 2]
+
+
+def test_set():
+    doc = {"a": [{"b": 1}]}
+    JSONPath.from_string("/a/0/b").set(doc, 2)
+    assert doc == {"a": [{"b": 2}]}
+
+
+def test_pickle_keeps_steps():
+    p = pickle.loads(pickle.dumps(JSONPath.from_string("/a/0")))
+    assert p == JSONPath("a", "0")
+    assert p.get({"a": [5]}) == 5
+
+
+def test_path_set_matches_per_path_get():
+    paths = [JSONPath.from_string(p) for p in ("/a/0/b", "/a/0/c", "/a/1", "/d", "/a/0/b", "")]
+    docs = [{"a": [{"b": 1, "c": 2}, 3], "d": 4}, {"a": [{}]}, {"a": []}, {}]
+    ps = PathSet(paths, default="missing")
+    for doc in docs:
+        assert ps(doc) == tuple(p.get(doc, "missing") for p in paths)
+    assert ps.extract_many(docs) == [ps.extract(doc) for doc in docs]
+
+
+def test_path_set_by_name():
+    ps = PathSet({"b": JSONPath("a", "b"), "c": JSONPath("a", "c")})
+    assert ps({"a": {"b": 1}}) == {"b": 1, "c": None}
+    assert PathSet([])({"a": 1}) == ()
+
+
+def test_path_set_attributes():
+    paths = [AttrPath("x", "y"), AttrPath("x", "z"), AttrPath("w")]
+    ps = PathSet(paths)
+    for obj in (SimpleNamespace(x=SimpleNamespace(y=1), w=2), SimpleNamespace()):
+        assert ps(obj) == tuple(p.get(obj) for p in paths)
+    with pytest.raises(TypeError):
+        PathSet(["/a"])
@@ -0,0 +1,168 @@
+import sys
+import itertools as it
+import threading
+import pytest
+
+linkedlist = pytest.importorskip("funklib.datatypes.linkedlist")
+List, SizedList, LazyList = linkedlist.List, linkedlist.SizedList, linkedlist.LazyList
+ChunkedLazyList = linkedlist.ChunkedLazyList
+RetentionMonitor = linkedlist.RetentionMonitor
+synchronized = linkedlist.synchronized
+ListSlice = pytest.importorskip("funklib.datatypes.listview").ListSlice
+
+# longer than the recursion limit, for chains of lazy operations
+DEEP = sys.getrecursionlimit() * 5
+
+
+def test_slice_returns_list():
+    xs = List(1, 2, 3, 4, 5)
+    assert xs[0:2] == List(1, 2)
+    assert type(xs[1:3]) is List
+    assert list(xs[::2]) == [1, 3, 5]
+    assert xs[2:] is xs.drop(2)
+    assert list(xs[10:12]) == []
+
+
+def test_sized_list_slice_keeps_type():
+    xs = SizedList.from_iterable(range(5))
+    assert type(xs[1:3]) is SizedList
+    assert list(xs[1:3]) == [1, 2]
+
+
+def test_view_shares_cells():
+    xs = List(1, 2, 3, 4, 5)
+    view = xs.view(slice(1, 5, 2))
+    assert isinstance(view, ListSlice)
+    assert view.cells is xs.drop(1)
+    assert list(view) == [2, 4]
+    assert len(view) == 2
+    assert view.to_list() == List(2, 4)
+
+
+def test_synchronized_cycle_raises():
+    s = synchronized(lambda: s.compute() + 1)
+    with pytest.raises(RuntimeError):
+        s.compute()
+    # the lock is released, so the computation can still be forced after the failure
+    s._thunk = lambda: 1
+    assert s.compute() == 1
+
+
+def test_synchronized_indirect_cycle_raises():
+    a = synchronized(lambda: b.compute())
+    b = synchronized(lambda: a.compute())
+    with pytest.raises(RuntimeError):
+        a.compute()
+
+
+def test_synchronized_evaluated_once_across_threads():
+    calls = []
+    s = synchronized(lambda: calls.append(1) or 5)
+    threads = [threading.Thread(target=s.compute) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert s.value == 5 and len(calls) == 1
+
+
+def test_lazy_fmap_chain_stack_safe():
+    xs = LazyList.from_iterable(range(10))
+    for _ in range(DEEP):
+        xs = xs.fmap(lambda x: x + 1)
+    assert list(xs) == [x + DEEP for x in range(10)]
+
+
+def test_lazy_repeated_appends_stack_safe():
+    xs = LazyList(0)
+    for i in range(1, DEEP):
+        xs = xs + [i]
+    assert list(xs) == list(range(DEEP))
+
+
+def test_lazy_join_stack_safe():
+    xs = LazyList.from_iterable([] if i % 2 else [i] for i in range(DEEP)).join()
+    assert list(xs) == list(range(0, DEEP, 2))
+    assert list(LazyList(1, 2).then(lambda x: [x, x])) == [1, 1, 2, 2]
+
+
+def test_lazy_repr_of_long_list():
+    xs = LazyList.from_iterable(range(DEEP))
+    list(xs)
+    assert repr(xs).startswith("LazyList(0, 1, 2")
+
+
+def pulled(values, seen):
+    """Iterator over values, recording each value pulled in seen"""
+    for x in values:
+        seen.append(x)
+        yield x
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64])
+def test_chunked_lazy_list_against_list(chunk_size):
+    reference = list(range(50))
+    xs = ChunkedLazyList.from_iterable(reference, chunk_size=chunk_size)
+    assert list(xs) == reference
+    assert list(xs.fmap(lambda x: x * 2)) == [x * 2 for x in reference]
+    assert list(xs + [50, 51]) == reference + [50, 51]
+    assert list(xs.prepend(-1)) == [-1] + reference
+    for n in (0, 1, 2, 3, 10, 49, 50, 60):
+        assert list(xs.take(n)) == reference[:n]
+        assert list(xs.drop(n)) == reference[n:]
+    assert [xs[i] for i in (0, 1, 2, 3, 10, 49)] == [reference[i] for i in (0, 1, 2, 3, 10, 49)]
+    assert list(xs[5:20:3]) == reference[5:20:3]
+    assert xs.head == 0 and list(xs.tail) == reference[1:]
+    nested = ChunkedLazyList.from_iterable([[x, x] for x in range(10)], chunk_size=chunk_size)
+    assert list(nested.join()) == [x for x in range(10) for _ in range(2)]
+
+
+def test_chunked_lazy_list_pulls_by_chunk():
+    seen = []
+    xs = ChunkedLazyList.from_iterable(pulled(range(100), seen), chunk_size=10)
+    assert len(seen) == 10
+    assert list(it.islice(xs, 15)) == list(range(15))
+    assert len(seen) == 20
+
+
+def test_chunked_join_is_lazy():
+    seen = []
+    xs = ChunkedLazyList.from_iterable(pulled(([x] for x in range(10)), seen), chunk_size=2).join()
+    assert list(it.islice(xs, 2)) == [0, 1]
+    assert len(seen) == 2
+
+
+def test_stream_releases_consumed_cells():
+    monitor = RetentionMonitor()
+    cursor = LazyList.stream(range(1000), monitor)
+    for x in cursor:
+        assert monitor.retained <= 2
+    assert monitor.created == 1000
+    assert cursor.position == 1000
+
+
+def test_head_reference_retains_cells():
+    monitor = RetentionMonitor()
+    xs = LazyList.from_iterable(range(100), monitor)
+    assert sum(xs) == sum(range(100))
+    assert monitor.retained == 100
+    del xs
+    assert monitor.retained == 0
+
+
+def test_forked_cursor_retains_until_consumed():
+    monitor = RetentionMonitor()
+    cursor = LazyList.stream(range(100), monitor)
+    fork = cursor.fork()
+    cursor.drop(50)
+    assert monitor.retained >= 50
+    fork.drop(50)
+    assert monitor.retained <= 2
+    assert next(fork) == next(cursor) == 50
+
+
+def test_chunked_stream_releases_consumed_chunks():
+    monitor = RetentionMonitor()
+    for x in ChunkedLazyList.stream(range(1000), monitor, chunk_size=10):
+        assert monitor.retained <= 2
+    assert monitor.created == 100
@@ -0,0 +1,134 @@
+from collections import namedtuple
+from dataclasses import dataclass
+from operator import itemgetter
+from types import SimpleNamespace
+import pytest
+from funklib.optics.lens import Lens, DictItem, TupleItem, Attribute
+from funklib.optics.prism import Prism, NoMatch
+from funklib.optics.adt import field_lens
+from funklib.datatypes.persistent import PersistentMap
+
+
+Point = namedtuple("Point", ("x", "y"))
+
+
+def inc(x):
+    return x + 1
+
+
+def test_update_in_place_mixed_chain_rebuilds_below_mutable_lens():
+    lens = DictItem("a").then(TupleItem(0)).then(field_lens(Point, "y"))
+    doc = {"a": [Point(1, 2), Point(3, 4)]}
+    points = doc["a"]
+    assert lens.update_in_place(doc, inc) is doc
+    assert doc["a"] is points
+    assert points == [Point(1, 3), Point(3, 4)]
+    lens.modify_in_place(inc)(doc)
+    assert points[0] == Point(1, 4)
+
+
+def test_update_in_place_immutable_innermost_lens():
+    first = Lens.from_functions(get=lambda s: s[0], modify=lambda f: lambda s: (f(s[0]),) + s[1:])
+    lens = DictItem("a").then(first)
+    doc = {"a": (1, 2)}
+    lens.update_in_place(doc, inc)
+    assert doc == {"a": (2, 2)}
+
+
+def test_tuple_item_on_lists():
+    lens = DictItem("a").then(TupleItem(0))
+    doc = {"a": [1, 2]}
+    assert lens.modify(inc)(doc) == {"a": [2, 2]}
+    assert doc == {"a": [1, 2]}
+    assert TupleItem(0).modify(inc)([1, 2]) == [2, 2]
+    assert TupleItem(-1).modify(inc)([1, 2]) == [1, 3]
+    assert DictItem("a").then(TupleItem(-1)).set(0)(doc) == {"a": [1, 0]}
+    assert lens.modify(inc)({"a": (1, 2)}) == {"a": (2, 2)}
+
+
+def test_update_in_place_assigns_above_immutable_containers():
+    lens = DictItem("a").then(TupleItem(0))
+    doc = {"a": (1, 2)}
+    assert lens.update_in_place(doc, inc) is doc
+    assert doc == {"a": (2, 2)}
+    points = [1, 2]
+    doc = {"a": points}
+    lens.update_in_place(doc, inc)
+    assert doc["a"] is points and points == [2, 2]
+
+    nested = DictItem("a").then(DictItem("b"))
+    inner = PersistentMap(b=1)
+    doc = {"a": inner}
+    nested.modify_in_place(inc)(doc)
+    assert doc["a"]["b"] == 2 and inner["b"] == 1
+
+    deep = TupleItem(0).then(TupleItem(0)).then(TupleItem(1))
+    doc = [((1, 2),)]
+    deep.update_in_place(doc, inc)
+    assert doc == [((1, 3),)]
+    with pytest.raises(TypeError):
+        deep.update_in_place((((1, 2),),), inc)
+
+
+def test_update_in_place_attribute_of_frozen_dataclass():
+    @dataclass(frozen=True)
+    class Frozen:
+        x: int
+
+    inner = Frozen(1)
+    holder = SimpleNamespace(p=inner)
+    Attribute("p").then(Attribute("x")).update_in_place(holder, inc)
+    assert holder.p == Frozen(2) and inner == Frozen(1)
+
+
+def test_update_in_place_without_mutable_lens():
+    lens = field_lens(Point, "x").then(field_lens(Point, "y"))
+    with pytest.raises(TypeError):
+        lens.update_in_place(Point(Point(1, 2), 3), inc)
+    with pytest.raises(TypeError):
+        field_lens(Point, "x").modify_in_place(inc)
+    assert lens.update(Point(Point(1, 2), 3), inc) == Point(Point(1, 3), 3)
+
+
+def test_composed_keyword_attribute():
+    lens = DictItem("a").then(Attribute("class"))
+    doc = {"a": SimpleNamespace(**{"class": 1})}
+    assert lens.get(doc) == 1
+    assert getattr(lens.set(2)(doc)["a"], "class") == 2
+
+
+class Keyword(tuple):
+    """ADT-like class with a keyword field name, as accepted by ADTMeta"""
+    _fields = ("lambda", "x")
+
+
+for i, field in enumerate(Keyword._fields):
+    setattr(Keyword, field, property(itemgetter(i)))
+
+
+def test_field_lens_keyword_field():
+    lens = field_lens(Keyword, "lambda")
+    k = Keyword((1, 2))
+    assert lens.get(k) == 1
+    assert lens.modify(inc)(k) == (2, 2)
+    assert type(lens.set(0)(k)) is Keyword
+    assert field_lens(Point, "x").then(lens).get(Point(k, 0)) == 1
+
+
+def test_prism_without_try_get_or_match():
+    with pytest.raises(TypeError):
+        class Incomplete(Prism):
+            def recover(self, a):
+                return a
+
+
+def test_prism_with_match_only():
+    class Even(Prism):
+        def match(self, s):
+            return s if s % 2 == 0 else NoMatch
+
+        def recover(self, a):
+            return a
+
+    assert Even().try_get(2).get(None) == 2
+    assert Even().try_get(3).get(None) is None
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+from funklib.core.path import resolve_attribute_path, parse_attribute_path, Attr, ForEach, Slice
+
+
+def order(*skus):
+    return SimpleNamespace(items=[SimpleNamespace(sku=sku) for sku in skus])
+
+
+def test_documented_slice_example():
+    obj = SimpleNamespace(orders=[order(1, 2), order(3), order()] + [order(i) for i in range(20)])
+    values = resolve_attribute_path(obj, "orders[0:10].items[-1].sku", "missing")
+    assert list(values) == [2, 3, "missing"] + list(range(7))
+
+
+def test_multiple_wildcards():
+    obj = SimpleNamespace(orders=[order(1, 2), order(3)])
+    assert list(parse_attribute_path("orders.*.items.*.sku").resolve(obj)) == [1, 2, 3]
+
+
+def test_keyword_attributes():
+    obj = SimpleNamespace(**{"from": [SimpleNamespace(x=1), SimpleNamespace(x=2)]})
+    assert list(resolve_attribute_path(obj, "from.*.x")) == [1, 2]
+    assert (Attr("from") >> Attr("__class__")).resolve(obj) is list
+    assert (Attr("class") >> Attr("x")).resolve(obj, "missing") == "missing"
+
+
+def test_non_iterables_resolve_to_default():
+    obj = SimpleNamespace(orders=[order(1), SimpleNamespace(items=None), order(2, 3)], a=5)
+    assert list(resolve_attribute_path(obj, "orders.*.items.*.sku", "missing")) == [1, "missing", 2, 3]
+    assert list(resolve_attribute_path(obj, "a.*", "missing")) == ["missing"]
+    assert list(resolve_attribute_path(obj, "a[0:2]", "missing")) == ["missing"]
+    assert list(resolve_attribute_path(obj, "orders[0:2].items[0:1].sku")) == [1, None]
+    assert list(ForEach().resolve(5, "missing")) == ["missing"]
+    assert list(Slice(0, 1).resolve(5, "missing")) == ["missing"]
+
+
+def test_descent_skips_non_iterables():
+    doc = {"a": [{"b": [1, 2]}, {"b": 3}], "c": {"b": None}}
+    values = parse_attribute_path("**[b].*").resolve(doc, "missing")
+    assert list(values) == [1, 2]
+
+
+def test_descent_walks_collections_not_attributes():
+    obj = SimpleNamespace(orders=[order(1), SimpleNamespace(sku=2)])
+    assert list(resolve_attribute_path(obj, "orders.**.sku")) == [2]
+    assert list(resolve_attribute_path(obj, "orders.*.items.*.sku")) == [1, None]
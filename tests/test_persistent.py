@@ -0,0 +1,58 @@
+import pytest
+from funklib.datatypes.persistent import PersistentMap, PersistentSet
+
+
+class Collider:
+    """Key with a constant hash, to exercise collision nodes"""
+    def __init__(self, name):
+        self.name = name
+
+    def __hash__(self):
+        return 42
+
+    def __eq__(self, other):
+        return isinstance(other, Collider) and other.name == self.name
+
+
+def test_transient_map_delete_twice():
+    t = PersistentMap((i, i) for i in range(100)).transient()
+    del t[3]
+    del t[4]
+    assert len(t) == 98
+    assert 3 not in t and 4 not in t
+    with pytest.raises(KeyError):
+        del t[3]
+    m = t.persistent()
+    assert len(m) == 98
+    assert dict(m) == {i: i for i in range(100) if i not in (3, 4)}
+
+
+def test_transient_map_delete_twice_colliding_keys():
+    a, b, c = Collider("a"), Collider("b"), Collider("c")
+    t = PersistentMap([(a, 1), (b, 2), (c, 3), (1, 1)]).transient()
+    del t[a]
+    del t[b]
+    assert len(t) == 2
+    assert a not in t and b not in t and c in t
+    with pytest.raises(KeyError):
+        del t[a]
+    assert len(t) == 2
+
+
+def test_transient_set_discard_twice():
+    t = PersistentSet(range(50)).transient()
+    t.discard(10)
+    t.discard(11)
+    t.discard(11)
+    t.discard(1000)
+    assert len(t) == 48
+    assert 10 not in t and 11 not in t and 12 in t
+    assert set(t.persistent()) == set(range(50)) - {10, 11}
+
+
+def test_persistent_map_discard():
+    m = PersistentMap({1: 1, 2: 2})
+    assert m.discard(3) is m
+    assert len(m.discard(1)) == 1
+    with pytest.raises(KeyError):
+        m.remove(3)
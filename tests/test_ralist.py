@@ -0,0 +1,41 @@
+import pytest
+
+RandomAccessList = pytest.importorskip("funklib.datatypes.ralist").RandomAccessList
+
+
+def test_indexing_and_update():
+    xs = RandomAccessList.from_iterable(range(100))
+    assert [xs[i] for i in range(100)] == list(range(100))
+    assert xs[-1] == 99
+    ys = xs.update(50, "x")
+    assert ys[50] == "x" and xs[50] == 50
+    assert list(ys) == list(range(50)) + ["x"] + list(range(51, 100))
+    with pytest.raises(IndexError):
+        xs[100]
+
+
+def test_prepend_head_tail():
+    xs = RandomAccessList(1, 2, 3).prepend(0)
+    assert xs.head == 0
+    assert list(xs.tail) == [1, 2, 3]
+    assert len(xs.tail) == 3
+
+
+def test_slices():
+    reference = list(range(20))
+    xs = RandomAccessList.from_iterable(reference)
+    for index in (slice(2, 10), slice(5, None), slice(None, 3), slice(2, 1), slice(8, 2),
+                  slice(-3, None), slice(1, 15, 3), slice(30, 40)):
+        assert list(xs[index]) == reference[index]
+        assert len(xs[index]) == len(reference[index])
+
+
+def test_take_drop_clamped():
+    xs = RandomAccessList(1, 2, 3)
+    assert xs.drop(-1) is xs
+    assert len(xs.drop(-1)) == 3
+    assert xs.drop(0) is xs
+    assert list(xs.drop(2)) == [3]
+    assert xs.drop(5).is_empty()
+    assert xs.take(-1).is_empty()
+    assert list(xs.take(2)) == [1, 2]
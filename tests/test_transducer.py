@@ -0,0 +1,82 @@
+import pytest
+
+try:
+    import funklib.core.transducer as transducer
+    from funklib.core.reducible import list_appender
+    from funklib.datatypes.failable import Success, Failure
+except ImportError as ex:
+    pytest.skip("dependencies not available: {}".format(ex), allow_module_level=True)
+
+
+def consumed(values, seen):
+    for x in values:
+        seen.append(x)
+        yield x
+
+
+def test_collecting_failables():
+    values = [Success(1), Success(2)]
+    assert transducer.transduce(transducer.collecting_failables(), list_appender, values) == Success([1, 2])
+
+
+def test_collecting_failables_stops_at_failure():
+    seen = []
+    values = [Success(1), Failure("a"), Success(2)]
+    result = transducer.transduce(transducer.collecting_failables(), list_appender, consumed(values, seen))
+    assert result == Failure("a")
+    assert len(seen) == 2
+
+
+def test_collecting_all_failables():
+    values = [Success(1), Failure("a"), Success(2), Failure("b")]
+    assert transducer.transduce(transducer.collecting_all_failables(), list_appender, values) == Failure(("a", "b"))
+
+
+def test_partitioning_failables():
+    values = [Success(1), Failure("a"), Success(2)]
+    assert transducer.transduce(transducer.partitioning_failables(), list_appender, values) == ([1, 2], ("a",))
+
+
+def test_result_replacing_transducers_are_not_lazy():
+    with pytest.raises(TypeError):
+        list(transducer.lazy_transduce(transducer.collecting_failables(), [Success(1)]))
+
+
+def test_mapping_failable():
+    values = [Success(1), Success(0), Failure("a")]
+    result = transducer.transduce(transducer.mapping_failable(lambda x: 1 // x), list_appender, values)
+    assert result[0] == Success(1)
+    assert result[1].is_failure() and isinstance(result[1].value, ZeroDivisionError)
+    assert result[2] == Failure("a")
+
+
+def test_binding_failable():
+    half = lambda x: Success(x // 2) if x % 2 == 0 else Failure(x)
+    values = [Success(4), Success(3), Failure("a")]
+    assert transducer.transduce(transducer.binding_failable(half), list_appender, values) == [
+        Success(2), Failure(3), Failure("a")
+    ]
+
+
+def test_stopping_on_failure():
+    values = [Success(1), Failure("a"), Success(2)]
+    assert list(transducer.lazy_transduce(transducer.stopping_on_failure(), values)) == [Success(1), Failure("a")]
+
+
+def test_routing_failures():
+    class Sink(list):
+        send = list.append
+
+    sink = Sink()
+    values = [Success(1), Failure("a"), Success(2)]
+    result = transducer.transduce(transducer.routing_failures(sink, unwrap=True), list_appender, values)
+    assert result == [1, 2]
+    assert sink == [Failure("a")]
+
+
+def test_counting_failures():
+    counter = {}
+    values = [Success(1), Failure(ValueError()), Failure(ValueError()), Failure(KeyError())]
+    result = transducer.transduce(transducer.counting_failures(counter), list_appender, values)
+    assert result == values
+    assert counter == {ValueError: 2, KeyError: 1}
@@ -0,0 +1,74 @@
+from collections import namedtuple
+from funklib.optics.lens import DictItem, TupleItem, Getter
+from funklib.optics.prism import Prism, NoMatch
+from funklib.optics.adt import field_lens
+from funklib.optics.traversal import (
+    Each, Filtered, Indices, DictValues, LensTraversal, ComposedTraversal, ComposedFold, traversal
+)
+
+
+Point = namedtuple("Point", ("x", "y"))
+
+
+def inc(x):
+    return x + 1
+
+
+class Even(Prism):
+    def match(self, s):
+        return s if s % 2 == 0 else NoMatch
+
+    def recover(self, a):
+        return a
+
+
+def test_each_keeps_container_type():
+    assert Each().update([1, 2], inc) == [2, 3]
+    assert Each().update((1, 2), inc) == (2, 3)
+    assert Each().update(frozenset([1, 2]), inc) == frozenset([2, 3])
+
+
+def test_indices_and_dict_values():
+    assert Indices(0, 2).update((1, 2, 3), inc) == (2, 2, 4)
+    assert Indices(0, 2).get_all([1, 2, 3]) == [1, 3]
+    assert DictValues().update({"a": 1, "b": 2}, inc) == {"a": 2, "b": 3}
+
+
+def test_composed_update_does_not_mutate():
+    t = DictItem("points").then(Each()).then(field_lens(Point, "y"))
+    doc = {"points": [Point(0, 1), Point(0, 2)], "name": "p"}
+    assert isinstance(t, ComposedTraversal)
+    assert t.get_all(doc) == [1, 2]
+    assert t.modify(inc)(doc) == {"points": [Point(0, 2), Point(0, 3)], "name": "p"}
+    assert doc["points"] == [Point(0, 1), Point(0, 2)]
+    assert t.set(0)(doc)["points"] == [Point(0, 0), Point(0, 0)]
+
+
+def test_consecutive_lenses_are_merged():
+    t = traversal(DictItem("a")).then(TupleItem(0)).then(Each())
+    assert len(t) == 2
+    assert isinstance(t[0], LensTraversal)
+    assert t.modify(inc)({"a": ([1, 2],)}) == {"a": ([2, 3],)}
+
+
+def test_filtered_and_prism_updates():
+    evens = Each().then(Filtered(lambda x: x % 2 == 0))
+    assert evens.modify(inc)([1, 2, 4]) == [1, 3, 5]
+    assert Each().then(Even()).get_all([1, 2, 4]) == [2, 4]
+    assert Each().then(Even()).modify(inc)([1, 2, 4]) == [1, 3, 5]
+
+
+def test_modify_many_matches_modify():
+    t = Each().then(DictValues())
+    records = [[{"a": x}, {"b": -x}] for x in range(5)]
+    assert t.modify_many(records, inc) == list(map(t.modify(inc), records))
+
+
+def test_getter_makes_a_fold():
+    class Length(Getter):
+        def get(self, s):
+            return len(s)
+
+    f = Each().then(Length())
+    assert isinstance(f, ComposedFold) and not isinstance(f, ComposedTraversal)
+    assert f.get_all(["ab", "c"]) == [2, 1]